@@ -0,0 +1,75 @@
+"""
+Benchmark of the robot command path on one machine.
+
+Starts a RobotStandInServer with the given delay/loss, drives a WebSocketClient with
+acknowledged commands at a fixed rate and reports round-trip percentiles, lost/late
+commands and reconnects:
+
+    python -m robot_navigation.benchmark.command_latency_benchmark --rate 20 --delay 15 --loss 0.02
+"""
+import argparse
+import json
+import math
+import time
+
+from robot_navigation.network.robot_stand_in_server import RobotStandInServer
+from robot_navigation.network.websocket_client import WebSocketClient
+
+def run_benchmark(args):
+    server = RobotStandInServer(
+        port=args.port, delay=args.delay / 1000.0, jitter=args.jitter / 1000.0, loss=args.loss,
+        disconnect_every=args.disconnect_every, seed=args.seed
+    )
+    server.start()
+    client = WebSocketClient(
+        f"ws://127.0.0.1:{args.port}/ws", min_send_interval=0.0, acknowledged=True,
+        ack_timeout=args.ack_timeout / 1000.0
+    )
+    time.sleep(0.2)
+
+    interval = 1.0 / args.rate
+    start = time.monotonic()
+    step = 0
+    while time.monotonic() - start < args.duration:
+        # A slowly varying command, so no command is suppressed as a duplicate.
+        speed = round(math.sin(step / 10.0), 3)
+        client.send_command(speed, -speed)
+        step += 1
+        time.sleep(max(0.0, start + step * interval - time.monotonic()))
+
+    # Wait for outstanding acks before reading the counters.
+    time.sleep(args.ack_timeout / 1000.0 + 0.1)
+    client.close()
+    server.stop()
+
+    results = client.command_stats()
+    results.update({
+        "issued": step,
+        "server_received": server.received_commands,
+        "server_dropped": server.dropped_commands,
+        "connections": server.connections,
+    })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure command round-trip times against a local robot stand-in.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--duration', type=float, default=10.0, help="Benchmark duration in seconds.")
+    parser.add_argument('--rate', type=float, default=20.0, help="Commands per second.")
+    parser.add_argument('--delay', type=float, default=0.0, help="Server one-way delay in ms.")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Server random extra delay in ms.")
+    parser.add_argument('--loss', type=float, default=0.0, help="Server command drop probability.")
+    parser.add_argument('--disconnect-every', type=float, default=None, help="Server drops connections every N seconds.")
+    parser.add_argument('--ack-timeout', type=float, default=500.0, help="Ack timeout in ms.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the results as JSON to this path.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
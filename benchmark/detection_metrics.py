@@ -0,0 +1,70 @@
+import numpy as np
+from robot_navigation.detection.iou import pairwise_iou
+
+COCO_IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+
+def average_precision(recall, precision):
+    """Area under the precision/recall curve with COCO style 101-point interpolation."""
+    # Make precision monotonically decreasing from right to left.
+    precision = np.maximum.accumulate(np.concatenate([[0.0], precision, [0.0]])[::-1])[::-1]
+    # The sentinel recall of 1.0 (with precision 0) catches recall points that are never reached.
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    indices = np.searchsorted(recall, np.linspace(0, 1, 101), side='left')
+    return float(precision[indices].mean())
+
+def match_predictions(predictions, ground_truth, iou_thresholds=COCO_IOU_THRESHOLDS):
+    """
+    Greedily match the predictions of one image to its ground truth boxes, highest confidence
+    first, for every IoU threshold at once.
+
+    :param predictions: float array of shape (N, 6) with [x1, y1, x2, y2, confidence, class_id].
+    :param ground_truth: float array of shape (M, 5) with [class_id, x1, y1, x2, y2].
+    :return: bool array of shape (N, T), True where a prediction is a true positive at threshold T.
+    """
+    true_positives = np.zeros((len(predictions), len(iou_thresholds)), dtype=bool)
+    if len(predictions) == 0 or len(ground_truth) == 0:
+        return true_positives
+    iou = pairwise_iou(predictions[:, None, :4], ground_truth[None, :, 1:5])
+    iou[predictions[:, 5, None] != ground_truth[None, :, 0]] = 0.0
+    for threshold_index, threshold in enumerate(iou_thresholds):
+        matched = np.zeros(len(ground_truth), dtype=bool)
+        for prediction_index in np.argsort(-predictions[:, 4], kind='stable'):
+            candidates = np.where(matched, 0.0, iou[prediction_index])
+            best = int(np.argmax(candidates))
+            if candidates[best] >= threshold:
+                matched[best] = True
+                true_positives[prediction_index, threshold_index] = True
+    return true_positives
+
+def mean_average_precision(predictions, ground_truths, iou_thresholds=COCO_IOU_THRESHOLDS):
+    """
+    COCO style mAP over all classes that occur in the ground truth.
+
+    :param predictions: List with one (N, 6) prediction array per image.
+    :param ground_truths: List with one (M, 5) ground truth array per image.
+    :return: dict with 'map50' (at IoU 0.5) and 'map50_95' (mean over the IoU thresholds).
+    """
+    true_positives = np.concatenate(
+        [match_predictions(p, g, iou_thresholds) for p, g in zip(predictions, ground_truths)]
+        + [np.zeros((0, len(iou_thresholds)), dtype=bool)]
+    )
+    all_predictions = np.concatenate([np.asarray(p).reshape(-1, 6) for p in predictions] + [np.empty((0, 6))])
+    ground_truth_classes = np.concatenate([np.asarray(g).reshape(-1, 5)[:, 0] for g in ground_truths] + [np.empty(0)])
+
+    classes = np.unique(ground_truth_classes)
+    if len(classes) == 0:
+        return {"map50": 0.0, "map50_95": 0.0}
+    ap = np.zeros((len(classes), len(iou_thresholds)))
+    for class_index, class_id in enumerate(classes):
+        selected = np.flatnonzero(all_predictions[:, 5] == class_id)
+        order = selected[np.argsort(-all_predictions[selected, 4], kind='stable')]
+        positives = np.count_nonzero(ground_truth_classes == class_id)
+        cumulative_tp = np.cumsum(true_positives[order], axis=0)
+        cumulative_fp = np.cumsum(~true_positives[order], axis=0)
+        for threshold_index in range(len(iou_thresholds)):
+            tp = cumulative_tp[:, threshold_index]
+            recall = tp / positives
+            precision = tp / np.maximum(tp + cumulative_fp[:, threshold_index], 1)
+            ap[class_index, threshold_index] = average_precision(recall, precision)
+    fifty = int(np.argmin(np.abs(np.asarray(iou_thresholds) - 0.5)))
+    return {"map50": float(ap[:, fifty].mean()), "map50_95": float(ap.mean())}
@@ -0,0 +1,93 @@
+import glob
+import os
+import cv2
+import numpy as np
+from robot_navigation.data.sensor_data_reader import SensorDataReader
+from robot_navigation.data.sensor_data_recorder import SESSION_FILE
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+def load_frame_pairs(directory, limit=None):
+    """
+    Load recorded frame pairs from a directory with 'left' and 'right' subdirectories, or
+    from a session recorded by SensorDataRecorder. Images are paired by sorted file name and
+    decoded up front, recorded sessions are loaded into memory, so disk I/O is not timed.
+
+    :param directory: Directory containing left/ and right/ image folders, or a recorded session.
+    :param limit: Optional maximum number of pairs to load.
+    :return: List of (left_frame, right_frame) tuples.
+    """
+    if os.path.exists(os.path.join(directory, SESSION_FILE)):
+        reader = SensorDataReader(directory)
+        return [
+            (np.array(reader[index].left_frame), np.array(reader[index].right_frame))
+            for index in range(len(reader) if limit is None else min(limit, len(reader)))
+        ]
+
+    def list_images(side):
+        paths = sorted(glob.glob(os.path.join(directory, side, '*')))
+        return [path for path in paths if path.lower().endswith(IMAGE_EXTENSIONS)]
+
+    left_paths = list_images('left')
+    right_paths = list_images('right')
+    if not left_paths or len(left_paths) != len(right_paths):
+        raise ValueError(f"Expected the same non-zero number of images in {directory}/left and {directory}/right.")
+
+    pairs = []
+    for left_path, right_path in list(zip(left_paths, right_paths))[:limit]:
+        pairs.append((cv2.imread(left_path), cv2.imread(right_path)))
+    return pairs
+
+def synthetic_frame_pairs(count, width=1280, height=720, seed=0):
+    """
+    Generate random noise frame pairs with the original camera resolution.
+
+    :param count: Number of distinct pairs (they are cycled during a run).
+    :param width: Frame width in pixels.
+    :param height: Frame height in pixels.
+    :param seed: Random seed.
+    :return: List of (left_frame, right_frame) tuples.
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8),
+         rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+        for _ in range(count)
+    ]
+
+def load_labeled_frames(directory, limit=None):
+    """
+    Load images with YOLO format labels: either an images/ and a labels/ subdirectory, or the
+    images and their .txt label files side by side. Each label line is
+    'class_id center_x center_y width height' relative to the image size; images without a
+    label file have no objects.
+
+    :param directory: Dataset directory.
+    :param limit: Optional maximum number of images to load.
+    :return: Tuple (frames, labels); labels[i] is a float array of shape (M, 5) with
+             [class_id, x1, y1, x2, y2] rows in pixels.
+    """
+    image_directory = os.path.join(directory, 'images')
+    label_directory = os.path.join(directory, 'labels')
+    if not os.path.isdir(image_directory):
+        image_directory = label_directory = directory
+    paths = sorted(
+        path for path in glob.glob(os.path.join(image_directory, '*')) if path.lower().endswith(IMAGE_EXTENSIONS)
+    )[:limit]
+    if not paths:
+        raise ValueError(f"No images found in {image_directory}.")
+
+    frames = []
+    labels = []
+    for path in paths:
+        frame = cv2.imread(path)
+        height, width = frame.shape[:2]
+        label_path = os.path.join(label_directory, os.path.splitext(os.path.basename(path))[0] + '.txt')
+        rows = np.empty((0, 5))
+        if os.path.exists(label_path):
+            rows = np.loadtxt(label_path, ndmin=2, usecols=range(5)).reshape(-1, 5)
+        centers = rows[:, 1:3] * [width, height]
+        half_sizes = rows[:, 3:5] * [width, height] / 2
+        frames.append(frame)
+        labels.append(np.column_stack([rows[:, 0], centers - half_sizes, centers + half_sizes]))
+    return frames, labels
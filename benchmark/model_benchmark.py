@@ -0,0 +1,307 @@
+"""
+Latency/accuracy comparison of detection model variants.
+
+Takes a model (.onnx, or .pt with ultralytics installed) and a folder of labeled frames
+(YOLO format, see load_labeled_frames) and benchmarks every variant that can run here:
+ONNX Runtime at FP32, FP16 and dynamically quantized INT8, for each input size and thread
+count, plus the Ultralytics backend on CUDA if available. Each variant runs in its own
+process so the peak memory is its own. Runs on CPU-only Linux:
+
+    python -m robot_navigation.benchmark.model_benchmark --model models/yolo11m_robot_detect_v2.onnx \\
+        --data datasets/robot_val --sizes 640 480 --threads 0 4 --write-config
+
+The winner is the fastest variant (batch 1 throughput) whose mAP50-95 is within
+--max-map-drop of the most accurate one; --write-config stores it in config.py.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import re
+import resource
+import time
+
+from robot_navigation.config import BASE_DIR
+from robot_navigation.benchmark.detection_metrics import mean_average_precision
+from robot_navigation.benchmark.frame_source import load_labeled_frames
+from robot_navigation.detection.detector_backend import create_detector_backend, cuda_available
+from robot_navigation.processing.pipeline_profiler import LatencyHistogram
+
+CONFIG_PATH = os.path.join(BASE_DIR, 'config.py')
+
+def max_rss_mb():
+    """Peak resident set size of this process in MiB (ru_maxrss is in KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def onnx_input_size(model_path):
+    """Fixed (height, width) input size of an ONNX model, or None for dynamic spatial axes."""
+    import onnxruntime as ort
+    shape = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"]).get_inputs()[0].shape
+    if isinstance(shape[2], int) and isinstance(shape[3], int):
+        return shape[2], shape[3]
+    return None
+
+def export_onnx(model_path, size, work_dir):
+    """Export a .pt model with Ultralytics to ONNX with dynamic axes for one input size."""
+    from ultralytics import YOLO
+    target = os.path.join(work_dir, f"{os.path.splitext(os.path.basename(model_path))[0]}_{size}.onnx")
+    if not os.path.exists(target):
+        exported = YOLO(model_path, task='detect').export(format='onnx', imgsz=size, dynamic=True, simplify=True)
+        os.replace(exported, target)
+    return target
+
+def convert_fp16(model_path, work_dir):
+    """FP16 copy of an ONNX model with float32 inputs and outputs (needs onnxconverter-common)."""
+    import onnx
+    from onnxconverter_common import float16
+    target = os.path.join(work_dir, os.path.splitext(os.path.basename(model_path))[0] + '_fp16.onnx')
+    if not os.path.exists(target):
+        onnx.save(float16.convert_float_to_float16(onnx.load(model_path), keep_io_types=True), target)
+    return target
+
+def quantize_int8(model_path, work_dir):
+    """Dynamically quantized INT8 copy of an ONNX model (weights INT8, activations quantized at runtime)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    target = os.path.join(work_dir, os.path.splitext(os.path.basename(model_path))[0] + '_int8.onnx')
+    if not os.path.exists(target):
+        quantize_dynamic(model_path, target, weight_type=QuantType.QInt8)
+    return target
+
+def model_variants(args):
+    """
+    List the variants to benchmark as dicts with 'name', 'backend', 'model_path', 'precision',
+    'input_size' and 'threads'. Variants whose conversion tools are missing are skipped with a note.
+    """
+    os.makedirs(args.work_dir, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(args.model))[0]
+    onnx_models = []
+    if args.model.endswith('.onnx'):
+        fixed_size = onnx_input_size(args.model)
+        sizes = args.sizes if fixed_size is None else [fixed_size[0]]
+        if fixed_size is not None and set(args.sizes) != {fixed_size[0]}:
+            print(f"{args.model} has a fixed input size of {fixed_size[1]}x{fixed_size[0]}, other sizes are skipped.")
+        onnx_models = [(size, args.model) for size in sizes]
+    else:
+        try:
+            onnx_models = [(size, export_onnx(args.model, size, args.work_dir)) for size in args.sizes]
+        except ImportError:
+            print("ultralytics is not installed, ONNX variants of the .pt model are skipped.")
+
+    variants = []
+    for size, model_path in onnx_models:
+        precisions = [("fp32", model_path)]
+        for precision, convert in (("fp16", convert_fp16), ("int8", quantize_int8)):
+            if precision not in args.precisions:
+                continue
+            try:
+                precisions.append((precision, convert(model_path, args.work_dir)))
+            except ImportError as e:
+                print(f"Skipping {precision} variants ({e.name} is not installed).")
+        for precision, path in precisions:
+            if precision not in args.precisions:
+                continue
+            for threads in args.threads:
+                variants.append({
+                    "name": f"onnxruntime-{precision}-{size}-t{threads}",
+                    "backend": "onnxruntime",
+                    "model_path": path,
+                    "precision": precision,
+                    "input_size": size,
+                    "threads": threads
+                })
+
+    if not args.model.endswith('.onnx') and cuda_available():
+        variants.append({
+            "name": f"ultralytics-{base_name}",
+            "backend": "ultralytics",
+            "model_path": args.model,
+            "precision": "model",
+            "input_size": None,
+            "threads": 0
+        })
+    return variants
+
+def benchmark_variant(variant, frames, labels, args):
+    """Measure one variant in the current process."""
+    baseline_rss = max_rss_mb()
+    backend = create_detector_backend(
+        variant["backend"], variant["model_path"], device=args.device, confidence_threshold=args.conf,
+        nms_iou_threshold=args.iou, input_size=variant["input_size"] or 640, threads=variant["threads"]
+    )
+    for index in range(args.warmup):
+        backend.predict([frames[index % len(frames)]])
+
+    # Batch 1: per image latency.
+    histogram = LatencyHistogram(window_size=len(frames) * args.repeat)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for frame in frames:
+            frame_start = time.perf_counter()
+            backend.predict([frame])
+            histogram.add(time.perf_counter() - frame_start, time.perf_counter())
+    batch1_fps = len(frames) * args.repeat / (time.perf_counter() - start)
+
+    # Batch 2: a left/right pair per call, as in the pipeline.
+    pairs = [frames[index:index + 2] for index in range(0, len(frames) - 1, 2)] or [[frames[0], frames[0]]]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for pair in pairs:
+            backend.predict(pair)
+    batch2_fps = 2 * len(pairs) * args.repeat / (time.perf_counter() - start)
+
+    # Accuracy with a low confidence threshold, as usual for mAP.
+    backend.confidence_threshold = args.map_conf
+    predictions = [backend.predict([frame])[0] for frame in frames]
+    accuracy = mean_average_precision(predictions, labels)
+    backend.close()
+
+    result = dict(variant)
+    result.update({
+        "latency_ms": histogram.percentiles(),
+        "batch1_fps": batch1_fps,
+        "batch2_fps": batch2_fps,
+        "peak_rss_mb": max_rss_mb(),
+        "rss_growth_mb": max_rss_mb() - baseline_rss,
+    })
+    result.update(accuracy)
+    return result
+
+def _benchmark_worker(variant, args, results):
+    try:
+        frames, labels = load_labeled_frames(args.data, limit=args.limit)
+        results.put(benchmark_variant(variant, frames, labels, args))
+    except Exception as e:
+        results.put(dict(variant, error=f"{type(e).__name__}: {e}"))
+
+def run_isolated(variant, args):
+    """Benchmark a variant in a fresh process, so peak memory and thread pools are its own."""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_benchmark_worker, args=(variant, args, results))
+    process.start()
+    while True:
+        try:
+            result = results.get(timeout=1.0)
+            break
+        except queue.Empty:
+            if process.is_alive():
+                continue
+            # The child may have put its result right before exiting.
+            try:
+                result = results.get(timeout=1.0)
+            except queue.Empty:
+                # Killed (e.g. by the OOM killer) or crashed in native code.
+                result = dict(variant, error=f"exit code {process.exitcode}")
+            break
+    process.join()
+    return result
+
+def select_winner(results, max_map_drop):
+    """Fastest variant (batch 1) whose mAP50-95 is within max_map_drop of the best one."""
+    valid = [result for result in results if "error" not in result]
+    if not valid:
+        return None
+    best_map = max(result["map50_95"] for result in valid)
+    eligible = [result for result in valid if result["map50_95"] >= best_map - max_map_drop]
+    return max(eligible, key=lambda result: result["batch1_fps"])
+
+def config_path_expression(path):
+    """Source expression for a path in config.py, relative to BASE_DIR where possible."""
+    path = os.path.abspath(path)
+    relative = os.path.relpath(path, BASE_DIR)
+    if relative.startswith(os.pardir):
+        return repr(path)
+    return "os.path.join(BASE_DIR, " + ", ".join(repr(part) for part in relative.split(os.sep)) + ")"
+
+def write_config(winner, config_path=CONFIG_PATH):
+    """Set the detector settings in config.py to the winning variant, keeping comments."""
+    values = {"DETECTOR_BACKEND": f'"{winner["backend"]}"'}
+    if winner["backend"] == "onnxruntime":
+        values.update({
+            "ONNX_MODEL_PATH": config_path_expression(winner["model_path"]),
+            "DETECTOR_INPUT_SIZE": str(winner["input_size"]),
+            "DETECTOR_THREADS": str(winner["threads"]),
+        })
+    else:
+        values["MODEL_PATH"] = config_path_expression(winner["model_path"])
+
+    with open(config_path, 'r') as f:
+        source = f.read()
+    for name, expression in values.items():
+        source, count = re.subn(
+            rf"^({name} = )[^#\n]*?(\s*#.*)?$", lambda m: m.group(1) + expression + (m.group(2) or ""),
+            source, count=1, flags=re.M
+        )
+        if count == 0:
+            source += f"{name} = {expression}\n"
+    with open(config_path, 'w') as f:
+        f.write(source)
+
+def print_results(results, winner):
+    print(f"{'variant':<40} {'p50':>8} {'p95':>8} {'p99':>8} {'b1 FPS':>8} {'b2 FPS':>8} "
+          f"{'RSS MiB':>8} {'mAP50':>7} {'mAP50-95':>9}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['name']:<40} failed: {result['error']}")
+            continue
+        latency = result["latency_ms"]
+        marker = " *" if result is winner else ""
+        print(f"{result['name']:<40} {latency.get('p50', 0):8.2f} {latency.get('p95', 0):8.2f} "
+              f"{latency.get('p99', 0):8.2f} {result['batch1_fps']:8.1f} {result['batch2_fps']:8.1f} "
+              f"{result['peak_rss_mb']:8.0f} {result['map50']:7.3f} {result['map50_95']:9.3f}{marker}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare detection model formats, precisions and input sizes.")
+    parser.add_argument('--model', required=True, help="Model to benchmark (.onnx, or .pt with ultralytics).")
+    parser.add_argument('--data', required=True, help="Directory with labeled frames (YOLO format).")
+    parser.add_argument('--work-dir', help="Directory for exported/converted models (default: <model dir>/benchmark).")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[640], help="Input sizes to try.")
+    parser.add_argument('--precisions', nargs='+', choices=('fp32', 'fp16', 'int8'), default=['fp32', 'fp16', 'int8'])
+    parser.add_argument('--threads', type=int, nargs='+', default=[0], help="ONNX Runtime intra-op threads to try.")
+    parser.add_argument('--device', default='cuda', help="Device of the Ultralytics backend.")
+    parser.add_argument('--conf', type=float, default=0.25, help="Confidence threshold for the timed runs.")
+    parser.add_argument('--map-conf', type=float, default=0.001, help="Confidence threshold for the mAP run.")
+    parser.add_argument('--iou', type=float, default=0.7, help="NMS IoU threshold.")
+    parser.add_argument('--limit', type=int, help="Maximum number of labeled frames to use.")
+    parser.add_argument('--warmup', type=int, default=5, help="Unmeasured warm-up inferences per variant.")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed passes over the frames.")
+    parser.add_argument('--max-map-drop', type=float, default=0.01,
+                        help="Accepted mAP50-95 loss of the winner relative to the most accurate variant.")
+    parser.add_argument('--in-process', action='store_true',
+                        help="Run all variants in this process (peak memory is then cumulative).")
+    parser.add_argument('--write-config', action='store_true', help="Write the winning variant into config.py.")
+    parser.add_argument('--output', help="Write the results as JSON to this path.")
+    args = parser.parse_args(argv)
+    if args.work_dir is None:
+        args.work_dir = os.path.join(os.path.dirname(os.path.abspath(args.model)), 'benchmark')
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    variants = model_variants(args)
+    if not variants:
+        print("No variant can run on this machine.")
+        return
+
+    results = []
+    if args.in_process:
+        frames, labels = load_labeled_frames(args.data, limit=args.limit)
+    for variant in variants:
+        print(f"Benchmarking {variant['name']} ...", flush=True)
+        results.append(benchmark_variant(variant, frames, labels, args) if args.in_process
+                       else run_isolated(variant, args))
+
+    winner = select_winner(results, args.max_map_drop)
+    print_results(results, winner)
+    if winner is not None:
+        print(f"Winner: {winner['name']}")
+        if args.write_config:
+            write_config(winner)
+            print(f"Detector settings written to {CONFIG_PATH}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"results": results, "winner": winner["name"] if winner else None}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
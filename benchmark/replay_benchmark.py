@@ -0,0 +1,186 @@
+"""
+Offline replay benchmark for the perception pipeline.
+
+Feeds recorded (or synthetic) frame pairs through FrameCropper and ProcessingPipelineManager
+with the real processing modules and reports throughput, per-stage latency and the memory
+high-water mark. With the stub detector it runs on a CPU-only machine without a robot:
+
+    python -m robot_navigation.benchmark.replay_benchmark --frames 300 --detections 20
+"""
+import argparse
+import json
+import resource
+import threading
+import time
+
+from robot_navigation.config import DISTANCES_PATH, MODEL_PATH, CROP_PATH, STEREO_BASELINE, FOCAL_LENGTH_PX
+from robot_navigation.camera.frame_cropper_auto import FrameCropper
+from robot_navigation.data.metrics_loader import MetricsLoader
+from robot_navigation.data.sensor_data_hub import SensorDataHub
+from robot_navigation.detection.distance_estimator import DistanceEstimator
+from robot_navigation.detection.stereo_triangulator import StereoTriangulator
+from robot_navigation.processing.processing_pipeline_manager import ProcessingPipelineManager
+from robot_navigation.processing.pipeline_profiler import PipelineProfiler
+from robot_navigation.processing.detection_processor import DetectionProcessor
+from robot_navigation.processing.distance_estimation_processor import DistanceEstimationProcessor
+from robot_navigation.processing.tracking_processor import TrackingProcessor
+from robot_navigation.processing.stereo_fusion_processor import StereoFusionProcessor
+from robot_navigation.processing.visualizing_processor import VisualizingProcessor
+from robot_navigation.tracking.deepsort_tracker import DeepSortTracker
+from robot_navigation.visualizing.frame_visualizer import FrameVisualizer
+from robot_navigation.benchmark.frame_source import load_frame_pairs, synthetic_frame_pairs
+from robot_navigation.benchmark.stub_detector import StubDetector
+
+class CountingSensorDataHub(SensorDataHub):
+    """SensorDataHub that counts updates and lets the benchmark wait for the last frame."""
+
+    def __init__(self, measure_from=0):
+        """
+        :param measure_from: First frame sequence number that counts as an update (warm-up
+                             frames still in the pipeline queues are not counted).
+        """
+        super().__init__()
+        self.measure_from = measure_from
+        self.updates = 0
+        self._condition = threading.Condition()
+
+    def update(self, sensor_data):
+        super().update(sensor_data)
+        with self._condition:
+            if sensor_data.sequence is not None and sensor_data.sequence >= self.measure_from:
+                self.updates += 1
+            self._condition.notify_all()
+
+    def wait_for_sequence(self, sequence, timeout):
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self.get_latest() is not None and self.get_latest().sequence >= sequence, timeout=timeout
+            )
+
+def max_rss_mb():
+    """Peak resident set size of this process in MiB (ru_maxrss is in KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def build_detector(args):
+    if args.detector == 'yolo':
+        # Imported lazily, so the stub path does not need ultralytics or a GPU.
+        from robot_navigation.detection.yolo_detector import YoloDetector
+        return YoloDetector(args.model, backend=args.backend, threads=args.threads)
+    return StubDetector(detections_per_frame=args.detections, latency=args.latency / 1000.0, seed=args.seed)
+
+def build_pipeline(args, hub, profiler):
+    metrics = MetricsLoader(DISTANCES_PATH).load_metrics()
+    # Unpaced, the pipelined queues block instead of dropping, so the throughput is the pipeline's capacity.
+    manager = ProcessingPipelineManager(
+        hub, pipelined=args.pipelined, queue_size=args.queue_size, profiler=profiler, backpressure=args.fps <= 0
+    )
+    manager.register_module(DetectionProcessor(build_detector(args)))
+    manager.register_module(DistanceEstimationProcessor(DistanceEstimator(metrics)), stage="post")
+    manager.register_module(TrackingProcessor(DeepSortTracker()), stage="post")
+    manager.register_module(
+        StereoFusionProcessor(StereoTriangulator(CROP_PATH, STEREO_BASELINE, FOCAL_LENGTH_PX)), stage="post"
+    )
+    manager.register_module(VisualizingProcessor(FrameVisualizer(), lazy=not args.visualize))
+    return manager
+
+def run_benchmark(args):
+    if args.input:
+        pairs = load_frame_pairs(args.input, limit=args.frames)
+    else:
+        pairs = synthetic_frame_pairs(args.synthetic_pairs, seed=args.seed)
+
+    hub = CountingSensorDataHub(measure_from=args.warmup)
+    profiler = PipelineProfiler(enabled=True, window_size=max(args.frames, 1))
+    cropper = FrameCropper(CROP_PATH, backend=args.crop_backend, zero_copy=not args.copy_crops)
+    manager = build_pipeline(args, hub, profiler)
+    manager.start()
+
+    baseline_rss = max_rss_mb()
+    frame_interval = 1.0 / args.fps if args.fps > 0 else 0.0
+    start = None
+    dropped_before = 0
+    next_frame_time = time.perf_counter()
+    for index in range(args.warmup + args.frames):
+        if frame_interval:
+            # Pace the replay like a camera running at args.fps.
+            next_frame_time += frame_interval
+            delay = next_frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if index == args.warmup:
+            # Measure only after warm-up; restart the histograms as well.
+            profiler.histograms.clear()
+            dropped_before = manager.dropped_frames
+            start = time.perf_counter()
+        left_frame, right_frame = pairs[index % len(pairs)]
+        with profiler.span("crop"):
+            left_frame, right_frame = cropper.crop_frames(left_frame, right_frame)
+        manager.process_and_update(left_frame, right_frame, sequence=index, capture_timestamp=time.monotonic())
+        if args.visualize:
+            # Act as a consumer that requests the (lazily drawn) visualized frames.
+            sensor_data = hub.get_latest()
+            if sensor_data is not None:
+                _ = sensor_data.left_frame_visualized, sensor_data.right_frame_visualized
+
+    last_sequence = args.warmup + args.frames - 1
+    hub.wait_for_sequence(last_sequence, timeout=30.0)
+    elapsed = time.perf_counter() - (start if start is not None else time.perf_counter())
+    manager.stop()
+    cropper.cleanup()
+
+    return {
+        "frames": args.frames,
+        "published": hub.updates,
+        "dropped": manager.dropped_frames - dropped_before,
+        "elapsed_s": elapsed,
+        "throughput_fps": hub.updates / elapsed if elapsed > 0 else 0.0,
+        "max_rss_mb": max_rss_mb(),
+        "rss_growth_mb": max_rss_mb() - baseline_rss,
+        "stages": profiler.summary(),
+    }
+
+def print_results(results):
+    print(f"Frames fed: {results['frames']}, published: {results['published']}, dropped: {results['dropped']}")
+    print(f"Elapsed: {results['elapsed_s']:.2f}s, throughput: {results['throughput_fps']:.1f} FPS")
+    print(f"Memory high-water mark: {results['max_rss_mb']:.1f} MiB "
+          f"(+{results['rss_growth_mb']:.1f} MiB during the run)")
+    for name, stats in sorted(results["stages"].items()):
+        print(f"  {name:<36} p50={stats.get('p50', 0):7.2f}ms p95={stats.get('p95', 0):7.2f}ms "
+              f"p99={stats.get('p99', 0):7.2f}ms")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay frame pairs through the perception pipeline.")
+    parser.add_argument('--input', help="Directory with left/ and right/ recorded frames (default: synthetic frames).")
+    parser.add_argument('--frames', type=int, default=300, help="Number of measured frame pairs.")
+    parser.add_argument('--warmup', type=int, default=20, help="Number of unmeasured warm-up frame pairs.")
+    parser.add_argument('--synthetic-pairs', type=int, default=8, help="Distinct synthetic pairs to cycle through.")
+    parser.add_argument('--fps', type=float, default=0.0,
+                        help="Replay rate in frame pairs per second (default: as fast as possible; with "
+                             "--pipelined the queues then block instead of dropping, measuring capacity).")
+    parser.add_argument('--detector', choices=('stub', 'yolo'), default='stub')
+    parser.add_argument('--model', default=MODEL_PATH, help="Model path for --detector yolo.")
+    parser.add_argument('--backend', choices=('auto', 'ultralytics', 'onnxruntime'), default='ultralytics',
+                        help="Inference backend for --detector yolo (onnxruntime needs an .onnx --model).")
+    parser.add_argument('--threads', type=int, default=0, help="ONNX Runtime intra-op threads (0: all cores).")
+    parser.add_argument('--detections', type=int, default=10, help="Stub detections per frame.")
+    parser.add_argument('--latency', type=float, default=0.0, help="Stub inference latency in ms per frame pair.")
+    parser.add_argument('--pipelined', action='store_true', help="Use the pipelined ProcessingPipelineManager.")
+    parser.add_argument('--queue-size', type=int, default=2)
+    parser.add_argument('--visualize', action='store_true', help="Also draw the visualized frames every frame.")
+    parser.add_argument('--crop-backend', choices=('auto', 'numpy', 'cuda', 'torch'), default='auto')
+    parser.add_argument('--copy-crops', action='store_true',
+                        help="Crop into pooled buffers instead of returning views of the replayed frames.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the results as JSON to this path.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmark(args)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import time
+import numpy as np
+from robot_navigation.config import CLASS_MAPPING
+from robot_navigation.data.detections import Detections
+
+class StubDetector:
+    def __init__(self, detections_per_frame=10, latency=0.0, disparity=40.0, seed=0):
+        """
+        Deterministic stand-in for YoloDetector that needs no model and no GPU.
+        It simulates a fixed set of objects drifting slowly through the frame, so tracking and
+        stereo matching see realistic, repeatable input. The right camera sees every object
+        shifted left by a constant disparity.
+
+        :param detections_per_frame: Number of detections returned per frame.
+        :param latency: Simulated inference time in seconds per detect_batch call.
+        :param disparity: Horizontal shift in pixels between left and right boxes.
+        :param seed: Seed for the object layout.
+        """
+        self.detections_per_frame = detections_per_frame
+        self.latency = latency
+        self.disparity = disparity
+        rng = np.random.default_rng(seed)
+        self.class_ids = rng.choice(sorted(CLASS_MAPPING), size=detections_per_frame)
+        # Relative box centers/sizes and drift per frame, all in fractions of the frame size.
+        self.centers = rng.uniform(0.15, 0.85, size=(detections_per_frame, 2))
+        self.sizes = rng.uniform(0.05, 0.25, size=(detections_per_frame, 2))
+        self.velocities = rng.uniform(-0.002, 0.002, size=(detections_per_frame, 2))
+        self.frame_counts = {}
+
+    def _detections(self, frame, camera_id, frame_index):
+        height, width = frame.shape[:2]
+        # Bounce the objects back and forth so they stay in view.
+        phase = (self.centers + self.velocities * frame_index - 0.15) % 1.4
+        centers = 0.15 + np.where(phase > 0.7, 1.4 - phase, phase)
+        boxes = np.concatenate([centers - self.sizes / 2, centers + self.sizes / 2], axis=1)
+        boxes *= [width, height, width, height]
+        if camera_id == 'right':
+            boxes[:, [0, 2]] -= self.disparity
+        return Detections(
+            bbox=boxes,
+            confidence=np.full(len(boxes), 0.9),
+            class_id=self.class_ids,
+            frame_width=width,
+            frame_height=height
+        )
+
+    def detect(self, frame, camera_id):
+        return self.detect_batch([frame], [camera_id])[0]
+
+    def detect_batch(self, frames, camera_ids):
+        if self.latency > 0:
+            time.sleep(self.latency)
+        results = []
+        for frame, camera_id in zip(frames, camera_ids):
+            frame_index = self.frame_counts.get(camera_id, 0)
+            self.frame_counts[camera_id] = frame_index + 1
+            results.append(self._detections(frame, camera_id, frame_index))
+        return results
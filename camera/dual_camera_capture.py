@@ -2,11 +2,41 @@ import cv2
 import time
 import threading
 import os
+import numpy as np
+
+from robot_navigation.camera.frame_cropper_auto import CropBufferPool
+from robot_navigation.camera.frame_pair import FramePair
+from robot_navigation.camera.frame_ring import FrameRing
 
 class DualCameraCapture:
-    def __init__(self, stream1_url, stream2_url):
+    def __init__(self, stream1_url, stream2_url, synchronized=False, ring_size=4, sync_tolerance=0.02,
+                 transform=None):
+        """
+        :param stream1_url: URL of the left camera stream.
+        :param stream2_url: URL of the right camera stream.
+        :param synchronized: Decode into preallocated frame rings (no per-frame copies) and pair
+                             left/right frames by nearest capture timestamp.
+        :param ring_size: Number of frame buffers per camera in synchronized mode.
+        :param sync_tolerance: Maximum capture time difference in seconds of a synchronized pair.
+        :param transform: Optional FrameTransform that crops and resizes the frames in the capture
+                          threads (inside the GStreamer pipeline if possible). Only the transformed
+                          frames are stored, they come from buffer pools that never overwrite a
+                          frame still held by a consumer.
+        """
         self.stream_urls = [stream1_url, stream2_url]
+        self.synchronized = synchronized
+        self.sync_tolerance = sync_tolerance
+        self.rings = [FrameRing(ring_size) for _ in range(2)] if synchronized else None
+        self.transform = transform
+        self.pools = [CropBufferPool(ring_size + 4) for _ in range(2)] if transform is not None else None
+        # One reused full-size decode buffer per camera when transforming on the CPU.
+        self.decode_buffers = [None, None]
         self.frames = {i: None for i in range(2)}
+        # Per-camera monotonic sequence number and capture time of the latest frame.
+        self.sequences = {i: 0 for i in range(2)}
+        self.timestamps = {i: None for i in range(2)}
+        # Notified whenever a camera stores a new frame.
+        self.frame_condition = threading.Condition()
         self.running = True
         self.threads = []
         
@@ -33,7 +63,12 @@ class DualCameraCapture:
         while attempts < 3:
             if self.use_gstreamer:
                 # Use GStreamer pipeline
-                pipeline = f"rtspsrc location={url} protocols=tcp latency=0 ! rtph264depay ! h264parse ! nvh264dec ! videoconvert ! appsink"
+                pipeline = f"rtspsrc location={url} protocols=tcp latency=0 ! rtph264depay ! h264parse ! nvh264dec ! "
+                transform_elements = self.transform.gstreamer_elements(cam_index) if self.transform else None
+                if transform_elements:
+                    # Crop and scale the raw video before the color conversion.
+                    pipeline += f"{transform_elements} ! "
+                pipeline += "videoconvert ! appsink"
                 cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
             else:
                 # Use FFMPEG
@@ -57,16 +92,156 @@ class DualCameraCapture:
             print(f"Failed to open camera {cam_index} stream after 3 attempts. Shutting down.")
             os._exit(1)
 
+        if self.synchronized:
+            self._capture_into_ring(cam_index, cap)
+            cap.release()
+            return
+
         while self.running:
             ret, frame = cap.read()
             if ret:
-                # Save a copy of the raw frame
-                self.frames[cam_index] = frame.copy()
+                timestamp = time.monotonic()
+                if self.transform is not None:
+                    # Keep only the (new) transformed frame.
+                    frame = self.transform.apply(cam_index, frame)
+                else:
+                    # Save a copy of the raw frame
+                    frame = frame.copy()
+                with self.frame_condition:
+                    self.frames[cam_index] = frame
+                    self.sequences[cam_index] += 1
+                    self.timestamps[cam_index] = timestamp
+                    self.frame_condition.notify_all()
             else:
                 print(f"Failed to grab frame from cam{cam_index}")
                 time.sleep(0.1)
         cap.release()
 
+    def _capture_into_ring(self, cam_index, cap):
+        """
+        Capture loop for synchronized mode: grab() first to timestamp the frame as close to
+        its arrival as possible, then retrieve() (decode) directly into a ring buffer.
+        """
+        ring = self.rings[cam_index]
+        while self.running:
+            if not cap.grab():
+                print(f"Failed to grab frame from cam{cam_index}")
+                time.sleep(0.1)
+                continue
+            timestamp = time.monotonic()
+
+            with self.frame_condition:
+                slot, buffer = ring.acquire()
+            if self.transform is not None:
+                ret, frame = self._retrieve_transformed(cam_index, cap)
+            elif buffer is not None:
+                ret, frame = cap.retrieve(buffer)
+            else:
+                ret, frame = cap.retrieve()
+            if not ret:
+                print(f"Failed to retrieve frame from cam{cam_index}")
+                continue
+
+            with self.frame_condition:
+                if self.transform is None and frame is not buffer:
+                    # First frame or changed frame size: (re)allocate the ring and copy once.
+                    frame = ring.store(slot, frame)
+                else:
+                    ring.assign(slot, frame)
+                self.sequences[cam_index] += 1
+                ring.commit(slot, self.sequences[cam_index], timestamp)
+                self.frames[cam_index] = frame
+                self.timestamps[cam_index] = timestamp
+                self.frame_condition.notify_all()
+
+    def _retrieve_transformed(self, cam_index, cap):
+        """
+        Decode the grabbed frame and transform it into a pooled buffer. When the GStreamer
+        pipeline already crops and scales, the frame is decoded straight into the pooled buffer,
+        otherwise the full frame is decoded into the camera's reused decode buffer first.
+        """
+        output = self.pools[cam_index].acquire(self.transform.output_shape(), np.uint8)
+        in_pipeline = self.use_gstreamer and self.transform.gstreamer_elements(cam_index) is not None
+        ret, frame = cap.retrieve(output if in_pipeline else self.decode_buffers[cam_index])
+        if not ret:
+            return False, None
+        if frame is output:
+            return True, output
+        if not in_pipeline:
+            self.decode_buffers[cam_index] = frame
+        if frame.shape[2:] != output.shape[2:]:
+            # Unexpected channel layout, let the transform allocate a matching frame.
+            return True, self.transform.apply(cam_index, frame)
+        return True, self.transform.apply(cam_index, frame, output)
+
+    def _latest_pair(self, newer_than):
+        if self.frames[0] is None or self.frames[1] is None:
+            return None
+        if newer_than is not None and (
+            self.sequences[0] <= newer_than.left_sequence or self.sequences[1] <= newer_than.right_sequence
+        ):
+            return None
+        return FramePair(
+            left_frame=self.frames[0],
+            right_frame=self.frames[1],
+            left_sequence=self.sequences[0],
+            right_sequence=self.sequences[1],
+            left_timestamp=self.timestamps[0],
+            right_timestamp=self.timestamps[1]
+        )
+
+    def _synchronized_pair(self, newer_than):
+        left_ring, right_ring = self.rings
+        left_slots = left_ring.newer_than(newer_than.left_sequence if newer_than is not None else 0)
+        right_slots = right_ring.newer_than(newer_than.right_sequence if newer_than is not None else 0)
+        if len(left_slots) == 0 or len(right_slots) == 0:
+            return None
+
+        left_times = left_ring.timestamps[left_slots]
+        right_times = right_ring.timestamps[right_slots]
+        in_sync = np.abs(left_times[:, None] - right_times[None, :]) <= self.sync_tolerance
+        if not in_sync.any():
+            return None
+        # Among the pairs within tolerance take the most recent one.
+        pair_times = np.where(in_sync, np.minimum(left_times[:, None], right_times[None, :]), -np.inf)
+        left_index, right_index = np.unravel_index(np.argmax(pair_times), pair_times.shape)
+        left_slot = left_slots[left_index]
+        right_slot = right_slots[right_index]
+        return FramePair(
+            left_frame=left_ring.frames[left_slot],
+            right_frame=right_ring.frames[right_slot],
+            left_sequence=int(left_ring.sequences[left_slot]),
+            right_sequence=int(right_ring.sequences[right_slot]),
+            left_timestamp=float(left_ring.timestamps[left_slot]),
+            right_timestamp=float(right_ring.timestamps[right_slot])
+        )
+
+    def wait_for_pair(self, newer_than=None, timeout=None):
+        """
+        Block until both cameras have produced a frame newer than the given pair.
+        In synchronized mode the returned frames are the most recent left/right frames whose
+        capture times differ by at most sync_tolerance. They live in the frame rings and stay
+        valid until the ring wraps around, so consumers should crop or copy them promptly
+        (unless a transform is used, whose pooled frames stay valid while they are held).
+
+        :param newer_than: The previously consumed FramePair, or None to accept any pair.
+        :param timeout: Maximum time to wait in seconds (None waits forever).
+        :return: A new FramePair, or None on timeout or when the capture is stopped.
+        """
+        select_pair = self._synchronized_pair if self.synchronized else self._latest_pair
+        pair = None
+
+        def ready():
+            nonlocal pair
+            if not self.running:
+                return True
+            pair = select_pair(newer_than)
+            return pair is not None
+
+        with self.frame_condition:
+            self.frame_condition.wait_for(ready, timeout=timeout)
+            return pair if self.running else None
+
     def start(self):
         for i in range(len(self.stream_urls)):
             thread = threading.Thread(target=self.capture_frames, args=(i,), daemon=True)
@@ -74,6 +249,8 @@ class DualCameraCapture:
             self.threads.append(thread)
 
     def stop(self):
-        self.running = False
+        with self.frame_condition:
+            self.running = False
+            self.frame_condition.notify_all()
         for thread in self.threads:
             thread.join()
\ No newline at end of file
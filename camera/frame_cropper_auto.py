@@ -0,0 +1,232 @@
+import json
+import sys
+import threading
+import time
+from typing import Tuple, Optional
+import cv2
+import numpy as np
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+class CropBufferPool:
+    def __init__(self, max_buffers=8):
+        """
+        Pool of output buffers for cropped frames. A buffer is only reused once nobody outside
+        the pool holds it (or a view of it) any more, so frames handed to downstream stages are
+        never overwritten while they are still in use. Each buffer is tagged with the generation
+        it was last written in, the oldest free buffer is reused first.
+
+        :param max_buffers: Maximum number of pooled buffers; beyond that, unpooled arrays are returned.
+        """
+        self.max_buffers = max_buffers
+        self.buffers = []
+        self.generations = []
+        self.generation = 0
+
+    def acquire(self, shape, dtype):
+        """Return a buffer of the given shape that is not referenced outside the pool."""
+        self.generation += 1
+        free_index = None
+        for index in range(len(self.buffers)):
+            # References: the pool list and the getrefcount argument, views count via their base.
+            if sys.getrefcount(self.buffers[index]) > 2:
+                continue
+            if self.buffers[index].shape != shape or self.buffers[index].dtype != dtype:
+                continue
+            if free_index is None or self.generations[index] < self.generations[free_index]:
+                free_index = index
+        if free_index is None:
+            buffer = np.empty(shape, dtype=dtype)
+            if len(self.buffers) < self.max_buffers:
+                self.buffers.append(buffer)
+                self.generations.append(self.generation)
+            else:
+                # All pooled buffers are still held downstream; drop stale ones of another size.
+                self._drop_mismatched(shape, dtype)
+            return buffer
+        self.generations[free_index] = self.generation
+        return self.buffers[free_index]
+
+    def _drop_mismatched(self, shape, dtype):
+        keep = [index for index, buffer in enumerate(self.buffers) if buffer.shape == shape and buffer.dtype == dtype]
+        self.buffers = [self.buffers[index] for index in keep]
+        self.generations = [self.generations[index] for index in keep]
+
+    def clear(self):
+        self.buffers = []
+        self.generations = []
+
+class FrameCropper:
+    def __init__(self, crop_path: str, backend: str = "auto", zero_copy: bool = True, pool_size: int = 8,
+                 calibration_iterations: int = 10):
+        """Initialize a FrameCropper that selects the fastest available backend.
+
+        In zero-copy mode the NumPy backend returns views into the input frames, which is only
+        safe if the caller does not overwrite the input frames while the crops are in use (e.g.
+        DualCameraCapture without synchronized mode stores a new array per frame). Otherwise the
+        crops are written into a CropBufferPool.
+
+        With backend="auto" a short microbenchmark on a synthetic frame picks the fastest of the
+        available backends (NumPy, cv2.cuda, torch); the GPU backends are only considered if a
+        CUDA device is present.
+
+        Args:
+            crop_path (str): Path to the JSON configuration file
+            backend (str): "auto", "numpy", "cuda" or "torch"
+            zero_copy (bool): Return views instead of copies with the NumPy backend
+            pool_size (int): Maximum number of pooled output buffers per camera
+            calibration_iterations (int): Timed crops per backend for backend="auto"
+        """
+        self.config = self._load_config(crop_path)
+        self.zero_copy = zero_copy
+        self._lock = threading.Lock()
+        self.pools = (CropBufferPool(pool_size), CropBufferPool(pool_size))
+
+        crop_width, crop_height = self.config["crop_width"], self.config["crop_height"]
+        self.left_rect = (self.config["left_crop_x"], self.config["left_crop_y"], crop_width, crop_height)
+        self.right_rect = (self.config["right_crop_x"], self.config["right_crop_y"], crop_width, crop_height)
+        self.left_slice = np.s_[
+            self.left_rect[1]:self.left_rect[1] + crop_height, self.left_rect[0]:self.left_rect[0] + crop_width
+        ]
+        self.right_slice = np.s_[
+            self.right_rect[1]:self.right_rect[1] + crop_height, self.right_rect[0]:self.right_rect[0] + crop_width
+        ]
+
+        # Per-backend resources, created lazily.
+        self._cuda_stream = None
+        self._gpu_frames = None
+        self._torch_device = None
+
+        available = self.available_backends()
+        if backend == "auto":
+            self.timings = self.calibrate(available, calibration_iterations)
+            self.backend = min(self.timings, key=self.timings.get)
+            summary = ", ".join(f"{name} {seconds * 1000:.3f} ms" for name, seconds in self.timings.items())
+            print(f"FrameCropper calibration: {summary} -> using {self.backend}")
+        elif backend in available:
+            self.timings = {}
+            self.backend = backend
+        else:
+            print(f"FrameCropper backend '{backend}' is not available, falling back to numpy.")
+            self.timings = {}
+            self.backend = "numpy"
+        self._crop = getattr(self, f"_crop_{self.backend}")
+
+    def _load_config(self, config_path: str) -> dict:
+        """Load cropping parameters from a JSON file."""
+        with open(config_path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def available_backends():
+        """Return the backends that can run on this machine, NumPy always."""
+        backends = ["numpy"]
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                backends.append("cuda")
+        except (AttributeError, cv2.error):
+            pass
+        if torch is not None and torch.cuda.is_available():
+            backends.append("torch")
+        return backends
+
+    def calibrate(self, backends, iterations=10):
+        """
+        Time each backend on a synthetic frame pair of the calibrated camera size.
+
+        :return: dict mapping backend names to the mean seconds per frame pair.
+        """
+        height = self.config.get("original_height", max(self.left_rect[1], self.right_rect[1]) + self.left_rect[3])
+        width = self.config.get("original_width", max(self.left_rect[0], self.right_rect[0]) + self.left_rect[2])
+        frame = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+        timings = {}
+        for name in backends:
+            crop = getattr(self, f"_crop_{name}")
+            try:
+                # Warm-up: allocations, CUDA context and kernel setup.
+                crop(frame, frame)
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    crop(frame, frame)
+                timings[name] = (time.perf_counter() - start) / iterations
+            except Exception as e:
+                print(f"FrameCropper backend {name} failed during calibration: {e}")
+        for pool in self.pools:
+            pool.clear()
+        return timings
+
+    def _outputs(self, left_frame, right_frame):
+        crop_shape = (self.left_rect[3], self.left_rect[2]) + left_frame.shape[2:]
+        return self.pools[0].acquire(crop_shape, left_frame.dtype), self.pools[1].acquire(crop_shape, right_frame.dtype)
+
+    def _crop_numpy(self, left_frame, right_frame):
+        left_view = left_frame[self.left_slice]
+        right_view = right_frame[self.right_slice]
+        if self.zero_copy:
+            return left_view, right_view
+        left_output, right_output = self._outputs(left_frame, right_frame)
+        np.copyto(left_output, left_view)
+        np.copyto(right_output, right_view)
+        return left_output, right_output
+
+    def _crop_cuda(self, left_frame, right_frame):
+        if self._cuda_stream is None:
+            self._cuda_stream = cv2.cuda.Stream()
+            self._gpu_frames = (cv2.cuda_GpuMat(), cv2.cuda_GpuMat())
+        left_output, right_output = self._outputs(left_frame, right_frame)
+        for frame, gpu_frame, rect, output in (
+            (left_frame, self._gpu_frames[0], self.left_rect, left_output),
+            (right_frame, self._gpu_frames[1], self.right_rect, right_output)
+        ):
+            gpu_frame.upload(frame, self._cuda_stream)
+            cv2.cuda_GpuMat(gpu_frame, rect).download(self._cuda_stream, output)
+        self._cuda_stream.waitForCompletion()
+        return left_output, right_output
+
+    def _crop_torch(self, left_frame, right_frame):
+        if self._torch_device is None:
+            self._torch_device = torch.device("cuda")
+        left_output, right_output = self._outputs(left_frame, right_frame)
+        for frame, crop_slice, output in (
+            (left_frame, self.left_slice, left_output),
+            (right_frame, self.right_slice, right_output)
+        ):
+            cropped = torch.from_numpy(frame).to(self._torch_device, non_blocking=True)[crop_slice]
+            torch.from_numpy(output).copy_(cropped)
+        return left_output, right_output
+
+    def crop_frames(self, left_frame: np.ndarray, right_frame: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Crop frames with the selected backend.
+
+        Args:
+            left_frame (np.ndarray): Left camera frame
+            right_frame (np.ndarray): Right camera frame
+
+        Returns:
+            Tuple[Optional[np.ndarray], Optional[np.ndarray]]: Cropped frames, views of the inputs in zero-copy mode
+        """
+        if left_frame is None or right_frame is None:
+            return None, None
+
+        with self._lock:
+            try:
+                return self._crop(left_frame, right_frame)
+            except Exception as e:
+                print(f"Error during frame cropping: {e}")
+                return None, None
+
+    def cleanup(self):
+        """Release pooled buffers and GPU resources."""
+        with self._lock:
+            for pool in self.pools:
+                pool.clear()
+            if self._gpu_frames is not None:
+                for gpu_frame in self._gpu_frames:
+                    gpu_frame.release()
+                self._gpu_frames = None
+                self._cuda_stream = None
+            if self._torch_device is not None:
+                torch.cuda.empty_cache()
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class FramePair:
+    left_frame: np.ndarray
+    right_frame: np.ndarray
+    # Monotonic per-camera frame sequence numbers (first frame is 1).
+    left_sequence: int
+    right_sequence: int
+    # Capture times from time.monotonic().
+    left_timestamp: float
+    right_timestamp: float
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the pair, i.e. the sequence of its older frame."""
+        return min(self.left_sequence, self.right_sequence)
+
+    @property
+    def timestamp(self) -> float:
+        """Capture time of the pair, i.e. the capture time of its older frame."""
+        return min(self.left_timestamp, self.right_timestamp)
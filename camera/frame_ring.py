@@ -0,0 +1,62 @@
+import numpy as np
+
+class FrameRing:
+    def __init__(self, size):
+        """
+        Small ring of preallocated frame buffers for one camera.
+        The buffers are allocated once the first frame size is known and then reused,
+        so decoding into the ring does not allocate per frame. A buffer handed out to
+        consumers stays valid until the ring wraps around to it (size - 1 frames later).
+
+        :param size: Number of frame buffers.
+        """
+        self.size = size
+        self.buffers = None
+        # Frame of each slot: a view of buffers, or an assigned array (see assign).
+        self.frames = [None] * size
+        # Sequence number per slot, -1 marks an empty slot or one that is being written.
+        self.sequences = np.full(size, -1, dtype=np.int64)
+        self.timestamps = np.zeros(size, dtype=np.float64)
+        self.head = 0
+
+    def acquire(self):
+        """
+        Reserve the next slot for writing and invalidate its previous content.
+
+        :return: Tuple (slot, buffer); buffer is None until the ring has been allocated.
+        """
+        slot = self.head
+        self.head = (self.head + 1) % self.size
+        self.sequences[slot] = -1
+        self.frames[slot] = None
+        buffer = self.buffers[slot] if self.buffers is not None else None
+        return slot, buffer
+
+    def store(self, slot, frame):
+        """
+        Copy a frame that was not decoded in place into the slot, (re)allocating the ring
+        if the frame size changed. Consumers holding old buffers keep valid references.
+        """
+        if self.buffers is None or self.buffers.shape[1:] != frame.shape or self.buffers.dtype != frame.dtype:
+            self.buffers = np.empty((self.size,) + frame.shape, dtype=frame.dtype)
+            self.sequences[:] = -1
+        np.copyto(self.buffers[slot], frame)
+        self.frames[slot] = self.buffers[slot]
+        return self.buffers[slot]
+
+    def assign(self, slot, frame):
+        """
+        Put a frame into the slot by reference instead of copying it into the ring, for frames
+        from a buffer pool that does not reuse them while consumers still hold them.
+        """
+        self.frames[slot] = frame
+        return frame
+
+    def commit(self, slot, sequence, timestamp):
+        """Mark a written slot as valid."""
+        self.timestamps[slot] = timestamp
+        self.sequences[slot] = sequence
+
+    def newer_than(self, sequence):
+        """Return the slots holding frames newer than the given sequence number."""
+        return np.flatnonzero(self.sequences > sequence)
@@ -0,0 +1,82 @@
+import json
+import cv2
+import numpy as np
+
+class FrameTransform:
+    def __init__(self, crop_path, long_side=None):
+        """
+        Crop (and optionally downscale) camera frames right where they are captured, so that
+        full-resolution frames are not kept around and the processing thread gets frames that
+        need no further cropping or resizing.
+
+        :param crop_path: Path to crop_calibration.json with the per-camera crop rectangles.
+        :param long_side: Length in pixels of the longer side of the output frames, e.g. the
+                          model input size. The aspect ratio is kept, so the detector does not
+                          resize again. None keeps the crop size.
+        """
+        with open(crop_path, 'r') as f:
+            config = json.load(f)
+        crop_width, crop_height = config["crop_width"], config["crop_height"]
+        # Per camera (x, y, width, height) of the crop in the original frame.
+        self.rects = [
+            (config["left_crop_x"], config["left_crop_y"], crop_width, crop_height),
+            (config["right_crop_x"], config["right_crop_y"], crop_width, crop_height)
+        ]
+        self.source_size = (config.get("original_width"), config.get("original_height"))
+        # Output size relative to the cropped frames.
+        self.scale = long_side / max(crop_width, crop_height) if long_side else 1.0
+        self.output_size = (round(crop_width * self.scale), round(crop_height * self.scale))
+
+    @property
+    def resizes(self):
+        return self.output_size != tuple(self.rects[0][2:])
+
+    def output_shape(self, channels=3):
+        """Shape of the transformed frames."""
+        return (self.output_size[1], self.output_size[0], channels)
+
+    def gstreamer_elements(self, cam_index):
+        """
+        GStreamer elements that crop and scale raw video to the output size inside the decode
+        pipeline, or None if the original frame size is not known from the calibration file.
+        """
+        source_width, source_height = self.source_size
+        if source_width is None or source_height is None:
+            return None
+        x, y, width, height = self.rects[cam_index]
+        elements = (
+            f"videocrop left={x} top={y} right={source_width - x - width} bottom={source_height - y - height}"
+        )
+        if self.resizes:
+            elements += (
+                f" ! videoscale add-borders=false"
+                f" ! video/x-raw,width={self.output_size[0]},height={self.output_size[1]}"
+            )
+        return elements
+
+    def apply(self, cam_index, frame, out=None):
+        """
+        Crop and resize a full frame of the given camera. Frames that already have the output
+        size (transformed by the decode pipeline) are passed through.
+
+        :param out: Optional array of the output shape to write into.
+        :return: The transformed frame (out if given).
+        """
+        frame_size = (frame.shape[1], frame.shape[0])
+        if frame_size == self.output_size and frame_size != self.source_size:
+            # Already cropped (and scaled) by the decode pipeline.
+            if out is None:
+                return frame
+            np.copyto(out, frame)
+            return out
+        x, y, width, height = self.rects[cam_index]
+        cropped = frame[y:y + height, x:x + width]
+        if not self.resizes:
+            if out is None:
+                return cropped.copy()
+            np.copyto(out, cropped)
+            return out
+        if out is None:
+            return cv2.resize(cropped, self.output_size, interpolation=cv2.INTER_AREA)
+        cv2.resize(cropped, self.output_size, dst=out, interpolation=cv2.INTER_AREA)
+        return out
@@ -2,9 +2,26 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, 'models', 'yolo11m_robot_detect_v2.engine')
+ONNX_MODEL_PATH = os.path.join(BASE_DIR, 'models', 'yolo11m_robot_detect_v2.onnx')
 DISTANCES_PATH = os.path.join(BASE_DIR, 'data', 'distances.json')
 CROP_PATH = os.path.join(BASE_DIR, 'data', 'crop_calibration.json')
 
+# Stereo camera geometry used for triangulation (adjust to the robot's cameras).
+STEREO_BASELINE = 0.06  # Distance between the two camera centers in meters.
+FOCAL_LENGTH_PX = 640.0  # Focal length in pixels of the original (uncropped) frames.
+
+# Camera capture: decode into preallocated rings and pair frames by capture time.
+CAPTURE_SYNCHRONIZED = True
+CAPTURE_RING_SIZE = 4
+CAPTURE_SYNC_TOLERANCE = 0.02  # Maximum left/right capture time difference in seconds.
+# Crop (and resize) in the capture threads, in the GStreamer pipeline if possible; the processing thread
+# then skips the FrameCropper. CAPTURE_RESIZE is the long side in pixels (the model input size), None keeps the crop size.
+CAPTURE_CROP = False
+CAPTURE_RESIZE = 640
+
+# Cropping: "auto" benchmarks the available backends ("numpy", "cuda", "torch") at startup and uses the fastest.
+CROP_BACKEND = "auto"
+
 # Mapping from model class id to label.
 CLASS_MAPPING = {
     0: 'robot',
@@ -14,3 +31,49 @@ CLASS_MAPPING = {
     4: 'wall_right',
     5: 'wall_top'
 }
+
+# Detection: "ultralytics" runs MODEL_PATH (TensorRT engine) on DETECTOR_DEVICE, "onnxruntime" runs ONNX_MODEL_PATH
+# on the CPU (or DETECTOR_PROVIDERS, e.g. ["OpenVINOExecutionProvider"]), "auto" picks ultralytics if CUDA is available.
+DETECTOR_BACKEND = "auto"
+DETECTOR_DEVICE = "cuda"
+DETECTOR_CONFIDENCE = 0.25
+DETECTOR_NMS_IOU = 0.7
+DETECTOR_INPUT_SIZE = 640  # Input size of the ONNX model if it is not fixed by the model.
+DETECTOR_THREADS = 0  # ONNX Runtime intra-op threads, 0 uses all physical cores.
+DETECTOR_PROVIDERS = None
+
+# Processing: run the pipeline stages on separate workers connected by bounded queues.
+PIPELINED_PROCESSING = False
+PIPELINE_QUEUE_SIZE = 2
+
+# Profiling: per-module latency histograms, printed with the processing loop report.
+PROFILING_ENABLED = False
+PROFILING_TRACE_PATH = None  # e.g. os.path.join(BASE_DIR, 'trace.json') to dump a Chrome trace on exit.
+
+# Navigation: decide on every new perception result, bounded by min/max command periods (seconds).
+NAVIGATOR_EVENT_DRIVEN = True
+NAVIGATOR_MIN_COMMAND_PERIOD = 0.05
+NAVIGATOR_MAX_COMMAND_PERIOD = 0.5
+# Commands are only sent or repeated while the perception result they are based on is at most this old
+# (seconds since capture). If capture or processing stalls, the robot drives blind on its last command for
+# at most NAVIGATOR_MAX_DATA_AGE + NAVIGATOR_MAX_COMMAND_PERIOD (1 s with the defaults) before the
+# navigator sends a stop (polling mode: NAVIGATOR_MAX_DATA_AGE + its 0.5 s decision interval).
+NAVIGATOR_MAX_DATA_AGE = 0.5
+
+# Recording: directory to record all SensorData to (None disables recording).
+RECORDING_PATH = None
+
+# Display: maximum refresh rate of the preview window (frames per second).
+DISPLAY_MAX_FPS = 30
+
+# Headless mode (or --headless): no OpenCV window, the controls and an MJPEG preview are served over HTTP.
+# Use "0.0.0.0" as host to view the preview from another machine.
+HEADLESS = False
+PREVIEW_HOST = "127.0.0.1"
+PREVIEW_PORT = 8080
+PREVIEW_MAX_FPS = 10
+PREVIEW_SCALE = 0.5
+PREVIEW_JPEG_QUALITY = 70
+# Token for the preview's control commands. None: no token on a loopback host, otherwise one is generated
+# and printed with the preview URL on start.
+PREVIEW_TOKEN = None
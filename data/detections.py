@@ -0,0 +1,193 @@
+from collections.abc import Mapping
+import numpy as np
+from robot_navigation.config import CLASS_MAPPING
+
+# Array lookup from class id to label, unknown ids fall back to str(class_id).
+CLASS_LABELS = np.array([CLASS_MAPPING.get(i, str(i)) for i in range(max(CLASS_MAPPING) + 1)], dtype=object)
+LABEL_CLASS_IDS = {label: class_id for class_id, label in CLASS_MAPPING.items()}
+
+def labels_for_class_ids(class_ids):
+    """Map an int array of class ids to an object array of labels."""
+    class_ids = np.asarray(class_ids, dtype=np.int64)
+    known = (class_ids >= 0) & (class_ids < len(CLASS_LABELS))
+    labels = np.empty(len(class_ids), dtype=object)
+    labels[known] = CLASS_LABELS[class_ids[known]]
+    labels[~known] = [str(class_id) for class_id in class_ids[~known]]
+    return labels
+
+def class_id_for_label(label):
+    """Inverse of labels_for_class_ids for a single label, -1 if unknown."""
+    if label in LABEL_CLASS_IDS:
+        return LABEL_CLASS_IDS[label]
+    return int(label) if isinstance(label, str) and label.lstrip('-').isdigit() else -1
+
+class Detections:
+    """
+    Detections of one camera frame as a struct of contiguous NumPy arrays.
+
+    - bbox: float array of shape (N, 4) with [x1, y1, x2, y2] in pixels
+    - confidence: float array of shape (N,)
+    - class_id: int array of shape (N,)
+    - distance: float array of shape (N,), NaN where no distance is known
+    - track_id: int array of shape (N,), -1 where no track is assigned
+
+    Indexing with an int returns a dict-compatible DetectionView of one row, iterating yields
+    these views, so code written for lists of detection dictionaries keeps working. Indexing
+    with a slice, a boolean mask or an index array returns a new Detections; slices share
+    the arrays with the original.
+    """
+    __slots__ = ("bbox", "confidence", "class_id", "distance", "track_id", "frame_width", "frame_height")
+
+    def __init__(self, bbox=None, confidence=None, class_id=None, distance=None, track_id=None,
+                 frame_width=None, frame_height=None):
+        """
+        :param frame_width: Width of the camera frame the boxes refer to.
+        :param frame_height: Height of the camera frame the boxes refer to.
+        """
+        self.bbox = np.asarray(bbox if bbox is not None else np.empty((0, 4)), dtype=np.float64).reshape(-1, 4)
+        count = len(self.bbox)
+        self.confidence = self._column(confidence, count, np.float64, 0.0)
+        self.class_id = self._column(class_id, count, np.int64, -1)
+        self.distance = self._column(distance, count, np.float64, np.nan)
+        self.track_id = self._column(track_id, count, np.int64, -1)
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+
+    @staticmethod
+    def _column(values, count, dtype, fill):
+        if values is None:
+            return np.full(count, fill, dtype=dtype)
+        values = np.asarray(values, dtype=dtype).reshape(-1)
+        if len(values) != count:
+            raise ValueError(f"Detections column of length {len(values)} does not match {count} boxes.")
+        return values
+
+    @classmethod
+    def from_dicts(cls, detections, frame_width=None, frame_height=None):
+        """
+        Build Detections from a list of detection dictionaries ('bbox', 'label' or 'class_id',
+        and optionally 'confidence', 'distance', 'track_id', 'camera_width', 'camera_height').
+        """
+        if detections and frame_width is None:
+            frame_width = detections[0].get("camera_width")
+        if detections and frame_height is None:
+            frame_height = detections[0].get("camera_height")
+        return cls(
+            bbox=[det["bbox"] for det in detections],
+            confidence=[det.get("confidence", 0.0) for det in detections],
+            class_id=[
+                det["class_id"] if det.get("class_id") is not None else class_id_for_label(det.get("label"))
+                for det in detections
+            ],
+            distance=[np.nan if det.get("distance") is None else det["distance"] for det in detections],
+            track_id=[-1 if det.get("track_id") is None else det["track_id"] for det in detections],
+            frame_width=frame_width,
+            frame_height=frame_height
+        )
+
+    @classmethod
+    def coerce(cls, detections):
+        """Return detections unchanged if they already are Detections, else convert a list of dictionaries."""
+        if isinstance(detections, cls):
+            return detections
+        return cls.from_dicts(list(detections or []))
+
+    @property
+    def labels(self):
+        """Object array of the labels of all rows."""
+        return labels_for_class_ids(self.class_id)
+
+    def __len__(self):
+        return len(self.bbox)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            return DetectionView(self, int(index))
+        return Detections(
+            self.bbox[index], self.confidence[index], self.class_id[index], self.distance[index],
+            self.track_id[index], self.frame_width, self.frame_height
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield DetectionView(self, index)
+
+    def __repr__(self):
+        return f"Detections({len(self)} rows, frame={self.frame_width}x{self.frame_height})"
+
+    def filter(self, mask):
+        """Return the rows selected by a boolean mask or index array."""
+        return self[np.asarray(mask)]
+
+    def min_distance(self, default=float('inf')):
+        """Smallest known distance, or default if no row has a distance."""
+        known = self.distance[~np.isnan(self.distance)]
+        return float(known.min()) if len(known) else default
+
+    def to_dicts(self):
+        """Convert to a list of plain detection dictionaries."""
+        return [dict(view) for view in self]
+
+class DetectionView(Mapping):
+    """
+    Dict-compatible view of one row of Detections. Reading 'distance' or 'track_id' gives
+    None where the row has none; assignments write through to the arrays.
+    """
+    __slots__ = ("detections", "index")
+    KEYS = ("label", "class_id", "bbox", "confidence", "distance", "track_id", "camera_width", "camera_height")
+
+    def __init__(self, detections, index):
+        self.detections = detections
+        self.index = index
+
+    def __getitem__(self, key):
+        detections, index = self.detections, self.index
+        if key == "bbox":
+            return detections.bbox[index].tolist()
+        if key == "label":
+            return labels_for_class_ids(detections.class_id[index:index + 1])[0]
+        if key == "class_id":
+            return int(detections.class_id[index])
+        if key == "confidence":
+            return float(detections.confidence[index])
+        if key == "distance":
+            distance = float(detections.distance[index])
+            return None if np.isnan(distance) else distance
+        if key == "track_id":
+            track_id = int(detections.track_id[index])
+            return None if track_id < 0 else track_id
+        if key == "camera_width":
+            return detections.frame_width
+        if key == "camera_height":
+            return detections.frame_height
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        detections, index = self.detections, self.index
+        if key == "bbox":
+            detections.bbox[index] = value
+        elif key == "label":
+            detections.class_id[index] = class_id_for_label(value)
+        elif key == "class_id":
+            detections.class_id[index] = value
+        elif key == "confidence":
+            detections.confidence[index] = value
+        elif key == "distance":
+            detections.distance[index] = np.nan if value is None else value
+        elif key == "track_id":
+            detections.track_id[index] = -1 if value is None else value
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"DetectionView({dict(self)})"
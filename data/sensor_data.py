@@ -1,14 +1,56 @@
 from dataclasses import dataclass, field
 from typing import List, Any
+import threading
 import numpy as np
+from robot_navigation.data.detections import Detections
 
 @dataclass
 class SensorData:
     left_frame: np.ndarray = None
     right_frame: np.ndarray = None
-    left_frame_visualized: np.ndarray = None
-    right_frame_visualized: np.ndarray = None
-    left_detections: List[dict] = field(default_factory=list)
-    right_detections: List[dict] = field(default_factory=list)
+    left_detections: Detections = field(default_factory=Detections)
+    right_detections: Detections = field(default_factory=Detections)
     left_tracking: List[Any] = field(default_factory=list)
     right_tracking: List[Any] = field(default_factory=list)
+    obstacles: List[dict] = field(default_factory=list)
+    # Frame pair sequence number and capture time (time.monotonic()) from DualCameraCapture.
+    sequence: int = None
+    capture_timestamp: float = None
+    # FrameVisualizer used to draw the visualized frames lazily on first access.
+    visualizer: Any = field(default=None, repr=False, compare=False)
+    _left_frame_visualized: np.ndarray = field(default=None, repr=False, compare=False)
+    _right_frame_visualized: np.ndarray = field(default=None, repr=False, compare=False)
+    _visualize_lock: Any = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def _visualize(self, frame, detections, tracking):
+        if self.visualizer is None or frame is None:
+            return None
+        return self.visualizer.draw_enriched_frame(frame.copy(), detections, tracking)
+
+    @property
+    def left_frame_visualized(self) -> np.ndarray:
+        """Annotated left frame, drawn in the caller's thread the first time it is requested."""
+        with self._visualize_lock:
+            if self._left_frame_visualized is None:
+                self._left_frame_visualized = self._visualize(
+                    self.left_frame, self.left_detections, self.left_tracking
+                )
+            return self._left_frame_visualized
+
+    @left_frame_visualized.setter
+    def left_frame_visualized(self, frame: np.ndarray):
+        self._left_frame_visualized = frame
+
+    @property
+    def right_frame_visualized(self) -> np.ndarray:
+        """Annotated right frame, drawn in the caller's thread the first time it is requested."""
+        with self._visualize_lock:
+            if self._right_frame_visualized is None:
+                self._right_frame_visualized = self._visualize(
+                    self.right_frame, self.right_detections, self.right_tracking
+                )
+            return self._right_frame_visualized
+
+    @right_frame_visualized.setter
+    def right_frame_visualized(self, frame: np.ndarray):
+        self._right_frame_visualized = frame
@@ -3,14 +3,43 @@ import threading
 class SensorDataHub:
     def __init__(self):
         self._latest = None
-        self._lock = threading.Lock()
+        self._version = 0
+        self._condition = threading.Condition()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register a callable that is invoked with every new SensorData (e.g. a recorder).
+        Listeners run on the updating thread, so they must return quickly.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
 
     def update(self, sensor_data):
-        """Atomically update the latest sensor data."""
-        with self._lock:
+        """Atomically update the latest sensor data and wake up waiting consumers."""
+        with self._condition:
             self._latest = sensor_data
+            self._version += 1
+            self._condition.notify_all()
+        for listener in self._listeners:
+            listener(sensor_data)
 
     def get_latest(self):
         """Atomically retrieve the latest sensor data."""
-        with self._lock:
+        with self._condition:
             return self._latest
+
+    def wait_for_update(self, after_version=0, timeout=None):
+        """
+        Block until sensor data newer than after_version is available.
+
+        :param after_version: Version returned by a previous call (0 accepts any data).
+        :param timeout: Maximum time to wait in seconds (None waits forever).
+        :return: Tuple (version, sensor_data); sensor_data is None on timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._version > after_version, timeout=timeout):
+                return after_version, None
+            return self._version, self._latest
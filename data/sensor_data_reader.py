@@ -0,0 +1,97 @@
+import json
+import os
+import time
+import numpy as np
+from robot_navigation.data.detections import Detections
+from robot_navigation.data.sensor_data import SensorData
+from robot_navigation.data.sensor_data_recorder import SESSION_FILE, frames_file, columns_file
+
+class SensorDataReader:
+    def __init__(self, directory):
+        """
+        Read a session written by SensorDataRecorder.
+        Frame chunks are memory-mapped, so the frames of a returned SensorData are read-only
+        views into the files and no frame data is copied.
+
+        :param directory: Session directory.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, SESSION_FILE), 'r') as f:
+            self.session = json.load(f)
+        frame_shape = tuple(self.session["frame_shape"] or ())
+        frame_dtype = np.dtype(self.session["frame_dtype"] or np.uint8)
+
+        self.frame_chunks = []
+        self.column_chunks = []
+        for chunk_index, frame_count in enumerate(self.session["chunks"]):
+            self.frame_chunks.append(np.memmap(
+                os.path.join(directory, frames_file(chunk_index)), dtype=frame_dtype, mode='r',
+                shape=(frame_count, 2) + frame_shape
+            ))
+            with np.load(os.path.join(directory, columns_file(chunk_index))) as columns:
+                self.column_chunks.append({key: columns[key] for key in columns.files})
+        self.chunk_offsets = np.cumsum([0] + list(self.session["chunks"]))
+
+    def __len__(self):
+        return int(self.chunk_offsets[-1])
+
+    @property
+    def hub_timestamps(self):
+        """Times (time.monotonic() of the recording process) at which each SensorData was published."""
+        return np.concatenate([columns["hub_timestamp"] for columns in self.column_chunks]) \
+            if self.column_chunks else np.empty(0)
+
+    def _detections(self, columns, frame_index, camera_index, frame_shape):
+        start, end = np.searchsorted(columns["detection_frame"], [frame_index, frame_index + 1])
+        rows = np.arange(start, end)
+        rows = rows[columns["detection_camera"][rows] == camera_index]
+        return Detections(
+            bbox=columns["bbox"][rows],
+            confidence=columns["confidence"][rows],
+            class_id=columns["class_id"][rows],
+            distance=columns["distance"][rows],
+            track_id=columns["track_id"][rows],
+            frame_width=frame_shape[1],
+            frame_height=frame_shape[0]
+        )
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        chunk_index = int(np.searchsorted(self.chunk_offsets, index, side='right')) - 1
+        frame_index = index - int(self.chunk_offsets[chunk_index])
+        frames = self.frame_chunks[chunk_index]
+        columns = self.column_chunks[chunk_index]
+        sequence = int(columns["sequence"][frame_index])
+        capture_timestamp = float(columns["capture_timestamp"][frame_index])
+        frame_shape = frames.shape[2:]
+        return SensorData(
+            left_frame=frames[frame_index, 0],
+            right_frame=frames[frame_index, 1],
+            left_detections=self._detections(columns, frame_index, 0, frame_shape),
+            right_detections=self._detections(columns, frame_index, 1, frame_shape),
+            sequence=None if sequence < 0 else sequence,
+            capture_timestamp=None if np.isnan(capture_timestamp) else capture_timestamp
+        )
+
+    def replay(self, sensor_data_hub=None, realtime=True, speed=1.0):
+        """
+        Yield the recorded SensorData in order, optionally publishing each one to a hub.
+
+        :param sensor_data_hub: Optional SensorDataHub that is updated with every SensorData.
+        :param realtime: Keep the original spacing between frames; otherwise replay as fast as possible.
+        :param speed: Playback speed factor for realtime replay.
+        """
+        timestamps = self.hub_timestamps
+        start = time.monotonic()
+        for index in range(len(self)):
+            if realtime and index > 0:
+                delay = (timestamps[index] - timestamps[0]) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            sensor_data = self[index]
+            if sensor_data_hub is not None:
+                sensor_data_hub.update(sensor_data)
+            yield sensor_data
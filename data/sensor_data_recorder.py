@@ -0,0 +1,215 @@
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from robot_navigation.data.detections import Detections
+
+SESSION_FILE = 'session.json'
+CAMERAS = ('left', 'right')
+
+def frames_file(chunk_index):
+    return f'frames_{chunk_index:05d}.bin'
+
+def columns_file(chunk_index):
+    return f'columns_{chunk_index:05d}.npz'
+
+class SensorDataRecorder:
+    def __init__(self, directory, chunk_size=300, queue_size=64, flush_interval=1.0):
+        """
+        Record every SensorData published by a SensorDataHub to disk.
+
+        Layout of a session directory:
+        - session.json: frame shape/dtype, chunk sizes and the recorder settings.
+        - frames_NNNNN.bin: raw frames of a chunk as one C-ordered (n, 2, H, W, C) array
+          (left, right), so a reader can memory-map it without copying.
+        - columns_NNNNN.npz: columnar per-frame data (sequence, timestamps) and per-detection
+          data (frame index, camera, bbox, confidence, class id, label, distance, track id).
+
+        Writing happens on a background thread; record() only enqueues and never blocks.
+        Every flush_interval seconds the current chunk's columns and session.json are written
+        as well (replacing the previous files atomically), so a crash or kill loses at most
+        that much of the most recent data.
+        If the queue is full, the SensorData is dropped and counted in dropped_frames.
+        The frames are written from the enqueued references, so they must not be reused by
+        upstream stages while queued.
+
+        :param directory: Session directory (created if missing).
+        :param chunk_size: Number of frame pairs per chunk file.
+        :param queue_size: Maximum number of SensorData waiting to be written.
+        :param flush_interval: Maximum time in seconds before written frames are readable.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.flush_interval = flush_interval
+        self.dropped_frames = 0
+        self.recorded_frames = 0
+        self.running = False
+        self.thread = None
+
+        self.frame_shape = None
+        self.frame_dtype = None
+        self.chunks = []
+        self._frames_handle = None
+        self._chunk_frames = 0
+        self._columns = None
+        self._unflushed = False
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self, sensor_data_hub):
+        """Start recording everything published by the given hub."""
+        self.start()
+        sensor_data_hub.add_listener(self.record)
+
+    def detach(self, sensor_data_hub):
+        sensor_data_hub.remove_listener(self.record)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record(self, sensor_data):
+        """Queue a SensorData for writing (non-blocking)."""
+        try:
+            self.queue.put_nowait((time.monotonic(), sensor_data))
+        except queue.Full:
+            self.dropped_frames += 1
+
+    def close(self):
+        """Write all queued data, finish the current chunk and stop the writer thread."""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self._finish_chunk()
+        self._write_session()
+
+    def _run(self):
+        while self.running or not self.queue.empty():
+            try:
+                hub_timestamp, sensor_data = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                sensor_data = None
+            try:
+                if sensor_data is not None:
+                    self._write(hub_timestamp, sensor_data)
+                if self._unflushed and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush()
+            except Exception as e:
+                print(f"Error while recording sensor data: {e}")
+
+    def _new_columns(self):
+        return {
+            "sequence": [], "capture_timestamp": [], "hub_timestamp": [],
+            "detection_frame": [], "detection_camera": [], "bbox": [], "confidence": [],
+            "class_id": [], "label": [], "distance": [], "track_id": []
+        }
+
+    def _write(self, hub_timestamp, sensor_data):
+        left_frame = sensor_data.left_frame
+        right_frame = sensor_data.right_frame
+        if left_frame is None or right_frame is None:
+            return
+        if self.frame_shape is None:
+            self.frame_shape = left_frame.shape
+            self.frame_dtype = left_frame.dtype
+        if left_frame.shape != self.frame_shape or right_frame.shape != self.frame_shape:
+            print(f"[Warning] Skipping frame with shape {left_frame.shape}, session uses {self.frame_shape}.")
+            return
+
+        if self._frames_handle is None:
+            self._frames_handle = open(os.path.join(self.directory, frames_file(len(self.chunks))), 'wb')
+            self._columns = self._new_columns()
+            self._chunk_frames = 0
+
+        for frame in (left_frame, right_frame):
+            # Writing a memoryview of a contiguous frame avoids a tobytes() copy.
+            self._frames_handle.write(memoryview(np.ascontiguousarray(frame, dtype=self.frame_dtype)))
+
+        columns = self._columns
+        frame_index = self._chunk_frames
+        columns["sequence"].append(sensor_data.sequence if sensor_data.sequence is not None else -1)
+        columns["capture_timestamp"].append(
+            sensor_data.capture_timestamp if sensor_data.capture_timestamp is not None else np.nan
+        )
+        columns["hub_timestamp"].append(hub_timestamp)
+        for camera_index, detections in enumerate((sensor_data.left_detections, sensor_data.right_detections)):
+            detections = Detections.coerce(detections)
+            count = len(detections)
+            columns["detection_frame"].extend([frame_index] * count)
+            columns["detection_camera"].extend([camera_index] * count)
+            columns["bbox"].extend(detections.bbox.tolist())
+            columns["confidence"].extend(detections.confidence.tolist())
+            columns["class_id"].extend(detections.class_id.tolist())
+            columns["label"].extend(detections.labels.tolist())
+            columns["distance"].extend(detections.distance.tolist())
+            columns["track_id"].extend(detections.track_id.tolist())
+
+        self._chunk_frames += 1
+        self.recorded_frames += 1
+        self._unflushed = True
+        if self._chunk_frames >= self.chunk_size:
+            self._finish_chunk()
+            self._write_session()
+
+    def _flush(self):
+        """Make the frames written so far readable: flush the frames file, then write its columns and the session."""
+        if self._frames_handle is not None:
+            self._frames_handle.flush()
+            self._write_columns()
+        self._write_session()
+        self._unflushed = False
+        self._last_flush = time.monotonic()
+
+    def _finish_chunk(self):
+        if self._frames_handle is None:
+            return
+        self._frames_handle.close()
+        self._frames_handle = None
+        self._write_columns()
+        self.chunks.append(self._chunk_frames)
+        self._columns = None
+
+    def _write_columns(self):
+        """Write the columns of the current chunk, replacing a previously flushed version."""
+        columns = self._columns
+        labels, label_codes = np.unique(np.array(columns["label"], dtype=str), return_inverse=True)
+        path = os.path.join(self.directory, columns_file(len(self.chunks)))
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(
+                f,
+                sequence=np.array(columns["sequence"], dtype=np.int64),
+                capture_timestamp=np.array(columns["capture_timestamp"], dtype=np.float64),
+                hub_timestamp=np.array(columns["hub_timestamp"], dtype=np.float64),
+                detection_frame=np.array(columns["detection_frame"], dtype=np.int64),
+                detection_camera=np.array(columns["detection_camera"], dtype=np.uint8),
+                bbox=np.array(columns["bbox"], dtype=np.float32).reshape(-1, 4),
+                confidence=np.array(columns["confidence"], dtype=np.float32),
+                class_id=np.array(columns["class_id"], dtype=np.int32),
+                label_table=labels,
+                label_code=label_codes.astype(np.int32),
+                distance=np.array(columns["distance"], dtype=np.float32),
+                track_id=np.array(columns["track_id"], dtype=np.int64)
+            )
+        os.replace(path + '.tmp', path)
+
+    def _write_session(self):
+        session = {
+            "frame_shape": list(self.frame_shape) if self.frame_shape is not None else None,
+            "frame_dtype": np.dtype(self.frame_dtype).str if self.frame_dtype is not None else None,
+            "cameras": list(CAMERAS),
+            "chunk_size": self.chunk_size,
+            # The open chunk is listed with the frames flushed so far.
+            "chunks": self.chunks + ([self._chunk_frames] if self._frames_handle is not None else []),
+            "dropped_frames": self.dropped_frames
+        }
+        path = os.path.join(self.directory, SESSION_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(session, f, indent=2)
+        os.replace(path + '.tmp', path)
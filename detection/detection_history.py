@@ -0,0 +1,64 @@
+import numpy as np
+
+class DetectionHistory:
+    def __init__(self, capacity, box_capacity=32):
+        """
+        Fixed-capacity ring buffer holding the boxes and label codes of the last frames
+        of one camera. Storage is preallocated as (capacity, box_capacity) arrays and only
+        grows when a frame contains more boxes than fit in a slot.
+
+        :param capacity: Number of frames to keep.
+        :param box_capacity: Initial number of boxes per frame slot.
+        """
+        self.capacity = capacity
+        self.boxes = np.zeros((capacity, box_capacity, 4), dtype=np.float64)
+        # Label code -1 marks an empty box slot that never matches anything.
+        self.labels = np.full((capacity, box_capacity), -1, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+        self.head = 0  # Slot that receives the next frame.
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self, box_capacity):
+        boxes = np.zeros((self.capacity, box_capacity, 4), dtype=np.float64)
+        labels = np.full((self.capacity, box_capacity), -1, dtype=np.int64)
+        boxes[:, :self.boxes.shape[1]] = self.boxes
+        labels[:, :self.labels.shape[1]] = self.labels
+        self.boxes = boxes
+        self.labels = labels
+
+    def append(self, boxes, labels):
+        """
+        Store the boxes of a new frame, overwriting the oldest frame once the buffer is full.
+
+        :param boxes: Array of shape (N, 4) with [x1, y1, x2, y2] boxes.
+        :param labels: Integer array of shape (N,) with label codes (>= 0).
+        """
+        count = len(boxes)
+        if count > self.boxes.shape[1]:
+            self._grow(max(count, 2 * self.boxes.shape[1]))
+        slot = self.head
+        self.boxes[slot, :count] = boxes
+        self.labels[slot, :count] = labels
+        self.labels[slot, count:] = -1
+        self.counts[slot] = count
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def update_latest(self, indices, boxes):
+        """Overwrite boxes of the most recently appended frame (e.g. after smoothing)."""
+        slot = (self.head - 1) % self.capacity
+        self.boxes[slot, indices] = boxes
+
+    def window(self):
+        """
+        Return the stored frames ordered from oldest to newest.
+
+        :return: Tuple (boxes, labels) of shapes (size, P, 4) and (size, P), where P is
+                 the largest box count of the stored frames. Unused slots have label -1.
+        """
+        order = (self.head - self.size + np.arange(self.size)) % self.capacity
+        width = int(self.counts[order].max(initial=0))
+        return self.boxes[order, :width], self.labels[order, :width]
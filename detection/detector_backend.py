@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+DETECTOR_BACKENDS = ("ultralytics", "onnxruntime")
+
+class DetectorBackend(ABC):
+    """Inference backend used by YoloDetector."""
+    name = None
+
+    @abstractmethod
+    def predict(self, frames):
+        """
+        Given a list of BGR frames, return one float32 array of shape (N, 6) per frame with
+        [x1, y1, x2, y2, confidence, class_id] rows in frame pixels.
+        """
+        pass
+
+    def close(self):
+        """Release the model."""
+        pass
+
+def empty_detections():
+    """Detections array of a frame without detections."""
+    return np.empty((0, 6), dtype=np.float32)
+
+def cuda_available():
+    """True if PyTorch can use a CUDA device."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+def resolve_detector_backend(name):
+    """Resolve "auto" to "ultralytics" if a CUDA device is available, "onnxruntime" otherwise."""
+    if name == "auto":
+        return "ultralytics" if cuda_available() else "onnxruntime"
+    return name
+
+def create_detector_backend(name, model_path, device='cuda', confidence_threshold=0.25, nms_iou_threshold=0.7,
+                            input_size=640, threads=0, providers=None):
+    """
+    Create a detector backend by name.
+
+    - "ultralytics": Ultralytics YOLO (TensorRT .engine, .pt, ...) on the given device.
+    - "onnxruntime": ONNX Runtime on the CPU (or the given providers, e.g. OpenVINO), with its
+                     own letterbox preprocessing and NMS. Needs an exported .onnx model.
+    - "auto": "ultralytics" if a CUDA device is available, "onnxruntime" otherwise.
+
+    :param device: Device for the Ultralytics backend.
+    :param confidence_threshold: Minimum confidence of a detection.
+    :param nms_iou_threshold: IoU threshold of the non-maximum suppression.
+    :param input_size: Model input size of the ONNX Runtime backend (if the model does not fix it).
+    :param threads: Intra-op threads of the ONNX Runtime backend, 0 lets ONNX Runtime decide.
+    :param providers: ONNX Runtime execution providers, default CPU only.
+    """
+    name = resolve_detector_backend(name)
+    if name == "ultralytics":
+        from robot_navigation.detection.ultralytics_backend import UltralyticsBackend
+        return UltralyticsBackend(model_path, device=device, confidence_threshold=confidence_threshold,
+                                  iou_threshold=nms_iou_threshold)
+    if name == "onnxruntime":
+        from robot_navigation.detection.onnx_runtime_backend import OnnxRuntimeBackend
+        return OnnxRuntimeBackend(model_path, input_size=input_size, confidence_threshold=confidence_threshold,
+                                  iou_threshold=nms_iou_threshold, threads=threads, providers=providers)
+    raise ValueError(f"Unknown detector backend '{name}', expected one of {DETECTOR_BACKENDS} or 'auto'.")
@@ -1,42 +1,123 @@
+import numpy as np
+from robot_navigation.config import CLASS_MAPPING
+from robot_navigation.data.detections import Detections
+
 class DistanceEstimator:
-    def __init__(self, metrics):
+    def __init__(self, metrics, class_mapping=CLASS_MAPPING, use_width=False):
         """
         Initialize with a dictionary mapping object labels to ObjectMetrics instances.
-        
+
+        The per-label constants are precomputed into arrays, so the distances of all detections
+        of a frame are computed in one NumPy expression.
+
         :param metrics: dict mapping labels to ObjectMetrics instances.
+        :param class_mapping: dict mapping model class ids to labels, used for Detections (class id arrays).
+        :param use_width: Combine the height based estimate with a width based one for detections
+                          whose aspect ratio (width / height) lies within the label's range.
         """
         self.metrics = metrics
+        self.use_width = use_width
+
+        labels = list(metrics)
+        self.label_rows = {label: row for row, label in enumerate(labels)}
+        # Class id -> metrics row, -1 selects the trailing NaN row for unknown classes.
+        self.class_rows = np.full(max(class_mapping) + 1, -1, dtype=np.int64)
+        for class_id, label in class_mapping.items():
+            self.class_rows[class_id] = self.label_rows.get(label, -1)
+
+        def column(attribute):
+            return np.array([getattr(metrics[label], attribute) for label in labels] + [np.nan], dtype=np.float64)
+
+        self.min_distance = column("estimated_min_distance")
+        self.max_distance = column("estimated_max_distance")
+        self.min_height_ratio = column("min_height_ratio")
+        self.max_height_ratio = column("max_height_ratio")
+        self.min_width_ratio = column("min_width_ratio")
+        self.max_width_ratio = column("max_width_ratio")
+        self.min_aspect_ratio = column("min_aspect_ratio")
+        self.max_aspect_ratio = column("max_aspect_ratio")
+        self.distance_span = self.max_distance - self.min_distance
+        self.inverse_max_height_ratio = 1 / self.max_height_ratio
+        self.height_scale = self.distance_span / (1 / self.min_height_ratio - 1 / self.max_height_ratio)
+        self.inverse_max_width_ratio = 1 / self.max_width_ratio
+        self.width_scale = self.distance_span / (1 / self.min_width_ratio - 1 / self.max_width_ratio)
+
+    def rows_for_class_ids(self, class_ids):
+        """Map model class ids to metrics rows (unknown ids map to the NaN row)."""
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        known = (class_ids >= 0) & (class_ids < len(self.class_rows))
+        return np.where(known, self.class_rows[np.where(known, class_ids, 0)], -1)
+
+    def rows_for_labels(self, labels):
+        """Map labels to metrics rows (unknown labels map to the NaN row)."""
+        return np.array([self.label_rows.get(label, -1) for label in labels], dtype=np.int64)
+
+    def estimate(self, bboxes, rows, frame_height, frame_width=None):
+        """
+        Estimate the distances of a set of detections.
+
+        :param bboxes: float array of shape (N, 4) with [x1, y1, x2, y2] in pixels.
+        :param rows: int array of shape (N,) with metrics rows (see rows_for_class_ids / rows_for_labels).
+        :param frame_height: Frame height in pixels, a scalar or an array of shape (N,).
+        :param frame_width: Frame width in pixels, required with use_width=True.
+        :return: float array of shape (N,) with distances, NaN for unknown labels.
+        """
+        bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        rows = np.asarray(rows, dtype=np.int64)
+        heights = bboxes[:, 3] - bboxes[:, 1]
+        min_distance = self.min_distance[rows]
+        max_distance = self.max_distance[rows]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            height_ratio = np.clip(heights / frame_height, self.min_height_ratio[rows], self.max_height_ratio[rows])
+            distances = min_distance + (1 / height_ratio - self.inverse_max_height_ratio[rows]) * self.height_scale[rows]
+
+            if self.use_width and frame_width is not None:
+                widths = bboxes[:, 2] - bboxes[:, 0]
+                width_ratio = np.clip(widths / frame_width, self.min_width_ratio[rows], self.max_width_ratio[rows])
+                width_distances = min_distance + (
+                    1 / width_ratio - self.inverse_max_width_ratio[rows]
+                ) * self.width_scale[rows]
+                aspect_ratio = widths / heights
+                plausible = (aspect_ratio >= self.min_aspect_ratio[rows]) & (aspect_ratio <= self.max_aspect_ratio[rows])
+                plausible &= np.asarray(frame_width) > 0
+                distances = np.where(plausible, 0.5 * (distances + width_distances), distances)
+
+        return np.clip(distances, min_distance, max_distance)
 
     def process_detections(self, detections):
         """
-        Process a list of detection dictionaries by computing and adding a 'distance' key to each.
-        The camera height is obtained directly from each detection's dictionary.
-        
-        :param detections: List of detection dictionaries. Each dictionary must contain:
+        Compute the distances of Detections in place, or process a list of detection dictionaries
+        by adding a 'distance' key to each. The camera height is obtained from the Detections'
+        frame size or directly from each detection's dictionary.
+
+        :param detections: Detections, or a list of detection dictionaries. Each dictionary must contain:
                            - 'bbox': [x1, y1, x2, y2]
                            - 'label': a string label for the detection.
                            - 'camera_height': the height of the camera frame.
-        :return: The updated list of detection dictionaries.
+                           and 'camera_width' when width estimation is enabled.
+        :return: The updated detections.
         """
-        for detection in detections:
-            camera_height = detection.get("camera_height")
-            label = detection.get("label")
-            if label in self.metrics and camera_height:
-                m = self.metrics[label]
-                bbox = detection.get("bbox")
-                detection_height = bbox[3] - bbox[1]
-                observed_height_ratio = detection_height / camera_height
-
-                if observed_height_ratio <= m.min_height_ratio:
-                    detection["distance"] = m.estimated_max_distance
-                elif observed_height_ratio >= m.max_height_ratio:
-                    detection["distance"] = m.estimated_min_distance
-                else:
-                    detection["distance"] = m.estimated_min_distance + (
-                        m.estimated_max_distance - m.estimated_min_distance
-                    ) * (1 / observed_height_ratio - 1 / m.max_height_ratio) / (
-                        1 / m.min_height_ratio - 1 / m.max_height_ratio
-                    )
+        if isinstance(detections, Detections):
+            if detections.frame_height:
+                rows = self.rows_for_class_ids(detections.class_id)
+                detections.distance = self.estimate(
+                    detections.bbox, rows, detections.frame_height, detections.frame_width or 0
+                )
             else:
-                detection["distance"] = None
+                detections.distance = np.full(len(detections), np.nan)
+            return detections
+        if not detections:
+            return detections
+
+        bboxes = np.array([detection["bbox"] for detection in detections], dtype=np.float64)
+        rows = self.rows_for_labels([detection.get("label") for detection in detections])
+        camera_heights = np.array([detection.get("camera_height") or 0 for detection in detections], dtype=np.float64)
+        camera_widths = np.array([detection.get("camera_width") or 0 for detection in detections], dtype=np.float64)
+        # Detections without a known label or camera height get no distance.
+        rows[camera_heights <= 0] = -1
+
+        distances = self.estimate(bboxes, rows, camera_heights, camera_widths)
+        for detection, distance in zip(detections, distances.tolist()):
+            detection["distance"] = None if np.isnan(distance) else distance
         return detections
@@ -0,0 +1,27 @@
+import numpy as np
+
+def pairwise_iou(boxes1, boxes2):
+    """
+    Compute the Intersection over Union (IoU) between two sets of bounding boxes.
+    Both inputs are broadcast against each other, so passing arrays of shape (N, 1, 4)
+    and (1, M, 4) yields the full (N, M) IoU matrix in a single vectorized pass.
+    The arithmetic mirrors the scalar compute_iou, so results are identical.
+
+    :param boxes1: Array-like of shape (..., 4) with [x1, y1, x2, y2] boxes.
+    :param boxes2: Array-like of shape (..., 4) with [x1, y1, x2, y2] boxes.
+    :return: Array of IoU values with the broadcast shape of the inputs without the last axis.
+    """
+    boxes1 = np.asarray(boxes1, dtype=np.float64)
+    boxes2 = np.asarray(boxes2, dtype=np.float64)
+    intersection_width = np.minimum(boxes1[..., 2], boxes2[..., 2]) - np.maximum(boxes1[..., 0], boxes2[..., 0])
+    intersection_height = np.minimum(boxes1[..., 3], boxes2[..., 3]) - np.maximum(boxes1[..., 1], boxes2[..., 1])
+    # Disjoint boxes get a zero intersection.
+    np.maximum(intersection_width, 0.0, out=intersection_width)
+    np.maximum(intersection_height, 0.0, out=intersection_height)
+    intersection_area = intersection_width * intersection_height
+    area1 = (boxes1[..., 2] - boxes1[..., 0]) * (boxes1[..., 3] - boxes1[..., 1])
+    area2 = (boxes2[..., 2] - boxes2[..., 0]) * (boxes2[..., 3] - boxes2[..., 1])
+    union_area = area1 + area2 - intersection_area
+    iou = np.zeros(union_area.shape, dtype=np.float64)
+    np.divide(intersection_area, union_area, out=iou, where=union_area != 0)
+    return iou
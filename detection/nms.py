@@ -0,0 +1,40 @@
+import numpy as np
+
+def non_max_suppression(boxes, scores, class_ids, iou_threshold=0.7, max_detections=300):
+    """
+    Class-aware greedy non-maximum suppression.
+
+    Boxes of different classes are shifted apart by a per-class offset, so they never overlap
+    and one pass handles all classes. Each step keeps the best remaining box and drops all
+    remaining boxes overlapping it in one vectorized IoU computation, so the number of Python
+    iterations is the number of kept boxes rather than the number of candidates (YOLO outputs
+    clusters of many overlapping candidates per object).
+
+    :param boxes: float array of shape (N, 4) with [x1, y1, x2, y2].
+    :param scores: float array of shape (N,).
+    :param class_ids: int array of shape (N,), boxes of different classes never suppress each other.
+    :param iou_threshold: Boxes overlapping a kept box by more than this are suppressed.
+    :param max_detections: Maximum number of kept boxes.
+    :return: int array with the indices of the kept boxes, highest score first.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    boxes = np.asarray(boxes, dtype=np.float64)
+    offsets = np.asarray(class_ids, dtype=np.float64)[:, None] * (boxes.max() - boxes.min() + 1.0)
+    shifted = boxes + offsets
+    x1, y1, x2, y2 = shifted.T
+    areas = (x2 - x1) * (y2 - y1)
+
+    order = np.argsort(-np.asarray(scores), kind='stable')
+    keep = []
+    while len(order) and len(keep) < max_detections:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        intersection_width = np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest])
+        intersection_height = np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest])
+        intersection = np.maximum(intersection_width, 0.0) * np.maximum(intersection_height, 0.0)
+        union = areas[best] + areas[rest] - intersection
+        iou = np.divide(intersection, union, out=np.zeros_like(intersection), where=union != 0)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
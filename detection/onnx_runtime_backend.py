@@ -0,0 +1,152 @@
+import cv2
+import numpy as np
+import onnxruntime as ort
+from robot_navigation.detection.detector_backend import DetectorBackend, empty_detections
+from robot_navigation.detection.nms import non_max_suppression
+
+LETTERBOX_COLOR = 114
+
+class OnnxRuntimeBackend(DetectorBackend):
+    name = "onnxruntime"
+
+    def __init__(self, model_path, input_size=640, confidence_threshold=0.25, iou_threshold=0.7, threads=0,
+                 providers=None, max_detections=300):
+        """
+        YOLO inference of an exported ONNX model with ONNX Runtime, for hosts without CUDA.
+        Preprocessing (letterbox, BGR to RGB, scaling to [0, 1]) writes into buffers that are
+        allocated once, and the raw model output is decoded and filtered with a vectorized NMS.
+
+        :param model_path: Path to the .onnx model (exported from Ultralytics).
+        :param input_size: Model input size, used if the model does not fix it.
+        :param threads: Intra-op threads, 0 lets ONNX Runtime use all physical cores.
+        :param providers: Execution providers, e.g. ["OpenVINOExecutionProvider"]; default CPU only.
+        :param max_detections: Maximum number of detections per frame.
+        """
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        # One model call at a time; inter-op parallelism only adds thread contention.
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=providers or ["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        batch, _, height, width = model_input.shape
+        # Dimensions are strings for dynamic axes.
+        self.fixed_batch = batch if isinstance(batch, int) else None
+        self.input_height = height if isinstance(height, int) else input_size
+        self.input_width = width if isinstance(width, int) else input_size
+        self.input_dtype = np.float16 if model_input.type == 'tensor(float16)' else np.float32
+        self.confidence_threshold = confidence_threshold
+        self.iou_threshold = iou_threshold
+        self.max_detections = max_detections
+
+        # Preallocated letterbox canvases (one per batch entry) and the model input blob.
+        self._canvases = []
+        self._canvas_layouts = []
+        self._planes = [np.empty((self.input_height, self.input_width), dtype=np.uint8) for _ in range(3)]
+        self._blob = None
+
+    def _letterbox_layout(self, frame_shape):
+        """Scale ratio and (left, top, width, height) of the resized frame inside the input."""
+        frame_height, frame_width = frame_shape[:2]
+        ratio = min(self.input_height / frame_height, self.input_width / frame_width)
+        width, height = round(frame_width * ratio), round(frame_height * ratio)
+        left = round((self.input_width - width) / 2 - 0.1)
+        top = round((self.input_height - height) / 2 - 0.1)
+        return ratio, (left, top, width, height)
+
+    def preprocess(self, frames):
+        """
+        Letterbox the frames into the preallocated input blob.
+
+        :return: Tuple (blob of shape (B, 3, H, W), list of (ratio, (left, top, width, height)) per frame).
+        """
+        batch_size = len(frames)
+        if self._blob is None or len(self._blob) < batch_size:
+            self._blob = np.empty((batch_size, 3, self.input_height, self.input_width), dtype=self.input_dtype)
+        while len(self._canvases) < batch_size:
+            self._canvases.append(np.empty((self.input_height, self.input_width, 3), dtype=np.uint8))
+            self._canvas_layouts.append(None)
+
+        layouts = []
+        for index, frame in enumerate(frames):
+            ratio, layout = self._letterbox_layout(frame.shape)
+            canvas = self._canvases[index]
+            if self._canvas_layouts[index] != layout:
+                # The border only needs to be painted when the frame size changes.
+                canvas[:] = LETTERBOX_COLOR
+                self._canvas_layouts[index] = layout
+            left, top, width, height = layout
+            if (width, height) == (frame.shape[1], frame.shape[0]):
+                canvas[top:top + height, left:left + width] = frame
+            else:
+                cv2.resize(frame, (width, height), dst=canvas[top:top + height, left:left + width],
+                           interpolation=cv2.INTER_LINEAR)
+            # HWC BGR uint8 -> CHW RGB in [0, 1], written straight into the blob.
+            cv2.split(canvas, self._planes)
+            for channel, plane in enumerate(reversed(self._planes)):
+                np.multiply(plane, 1.0 / 255.0, out=self._blob[index, channel], casting='unsafe')
+            layouts.append((ratio, layout))
+        return self._blob[:batch_size], layouts
+
+    def postprocess(self, output, ratio, layout, frame_shape):
+        """
+        Decode the raw output of one frame into [x1, y1, x2, y2, confidence, class_id] rows in
+        frame pixels.
+
+        :param output: Either (4 + classes, anchors) with [cx, cy, w, h, class scores...] per
+                       anchor, or (N, 6) rows from a model exported with NMS.
+        """
+        output = np.asarray(output, dtype=np.float32)
+        left, top = layout[:2]
+        if output.shape[-1] == 6:
+            # End-to-end model: boxes are already suppressed.
+            detections = output[output[:, 4] >= self.confidence_threshold].copy()
+        else:
+            scores = output[4:]
+            class_ids = scores.argmax(axis=0)
+            confidences = scores[class_ids, np.arange(scores.shape[1])]
+            candidates = np.flatnonzero(confidences >= self.confidence_threshold)
+            if len(candidates) == 0:
+                return empty_detections()
+            centers = output[:2, candidates].T
+            half_sizes = output[2:4, candidates].T / 2
+            boxes = np.concatenate([centers - half_sizes, centers + half_sizes], axis=1)
+            keep = non_max_suppression(
+                boxes, confidences[candidates], class_ids[candidates], self.iou_threshold, self.max_detections
+            )
+            detections = np.column_stack([
+                boxes[keep], confidences[candidates[keep]], class_ids[candidates[keep]]
+            ]).astype(np.float32)
+        # Undo the letterbox.
+        detections[:, [0, 2]] = (detections[:, [0, 2]] - left) / ratio
+        detections[:, [1, 3]] = (detections[:, [1, 3]] - top) / ratio
+        detections[:, [0, 2]] = np.clip(detections[:, [0, 2]], 0, frame_shape[1])
+        detections[:, [1, 3]] = np.clip(detections[:, [1, 3]], 0, frame_shape[0])
+        return detections
+
+    def predict(self, frames):
+        frames = list(frames)
+        if self.fixed_batch is None or len(frames) == self.fixed_batch:
+            return self._run(frames)
+        # Static batch size (e.g. exported with batch 1): run in chunks, padding the last one.
+        detections = []
+        for start in range(0, len(frames), self.fixed_batch):
+            chunk = frames[start:start + self.fixed_batch]
+            padded = chunk + [chunk[-1]] * (self.fixed_batch - len(chunk))
+            detections.extend(self._run(padded)[:len(chunk)])
+        return detections
+
+    def _run(self, frames):
+        blob, layouts = self.preprocess(frames)
+        outputs = self.session.run(None, {self.input_name: blob})[0]
+        return [
+            self.postprocess(output, ratio, layout, frame.shape)
+            for output, (ratio, layout), frame in zip(outputs, layouts, frames)
+        ]
+
+    def close(self):
+        self.session = None
@@ -0,0 +1,167 @@
+import json
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from robot_navigation.data.detections import Detections
+
+class StereoTriangulator:
+    def __init__(self, crop_path, baseline, focal_length, min_row_overlap=0.5, max_height_ratio=1.5,
+                 min_disparity=1.0, frame_scale=1.0):
+        """
+        Match left/right detections of the same object and triangulate them into 3D positions.
+        Detections are expected in cropped frame coordinates; the crop offsets from the
+        calibration file map them back into the original camera frames for triangulation.
+
+        :param crop_path: Path to crop_calibration.json.
+        :param baseline: Distance between the two cameras in meters.
+        :param focal_length: Focal length in pixels of the original frames.
+        :param min_row_overlap: Minimum vertical overlap (IoU of the y ranges) for a pair to match.
+        :param max_height_ratio: Maximum ratio between the box heights of a pair.
+        :param min_disparity: Minimum disparity in pixels, smaller values are rejected as unreliable.
+        :param frame_scale: Size of the processed frames relative to the cropped frames, when the
+                            frames are downscaled after cropping (see FrameTransform.scale).
+        """
+        with open(crop_path, 'r') as f:
+            config = json.load(f)
+        self.left_offset = np.array([config["left_crop_x"], config["left_crop_y"]], dtype=np.float64)
+        self.right_offset = np.array([config["right_crop_x"], config["right_crop_y"]], dtype=np.float64)
+        self.principal_point = np.array([config["original_width"] / 2, config["original_height"] / 2])
+        self.baseline = baseline
+        self.focal_length = focal_length
+        self.min_row_overlap = min_row_overlap
+        self.max_height_ratio = max_height_ratio
+        self.min_disparity = min_disparity
+        self.frame_scale = frame_scale
+
+    def match(self, left_boxes, left_labels, right_boxes, right_labels):
+        """
+        Associate left and right boxes in one vectorized pass.
+        The cost combines the vertical (epipolar) misalignment and the difference in box height;
+        pairs with different labels, too little row overlap or a non-positive disparity are gated.
+
+        :param left_boxes: Array of shape (N, 4) with [x1, y1, x2, y2] left boxes (cropped coordinates).
+        :param left_labels: Array of shape (N,) with labels.
+        :param right_boxes: Array of shape (M, 4) with [x1, y1, x2, y2] right boxes (cropped coordinates).
+        :param right_labels: Array of shape (M,) with labels.
+        :return: Tuple (left_indices, right_indices) of matched pairs as integer arrays.
+        """
+        if len(left_boxes) == 0 or len(right_boxes) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        left = left_boxes[:, None, :]
+        right = right_boxes[None, :, :]
+        row_overlap = np.minimum(left[..., 3], right[..., 3]) - np.maximum(left[..., 1], right[..., 1])
+        row_union = np.maximum(left[..., 3], right[..., 3]) - np.minimum(left[..., 1], right[..., 1])
+        row_iou = np.clip(row_overlap, 0.0, None) / np.maximum(row_union, 1e-9)
+
+        left_height = left[..., 3] - left[..., 1]
+        right_height = right[..., 3] - right[..., 1]
+        height_ratio = np.maximum(left_height, right_height) / np.maximum(np.minimum(left_height, right_height), 1e-9)
+
+        disparity = self.disparities(left_boxes[:, None, :], right_boxes[None, :, :])
+
+        valid = (
+            (left_labels[:, None] == right_labels[None, :])
+            & (row_iou >= self.min_row_overlap)
+            & (height_ratio <= self.max_height_ratio)
+            & (disparity >= self.min_disparity)
+        )
+        cost = (1.0 - row_iou) + (height_ratio - 1.0)
+        # Gated pairs get a cost that no valid assignment can reach.
+        cost = np.where(valid, cost, cost.max(initial=0.0) + 1e6)
+        left_indices, right_indices = linear_sum_assignment(cost)
+        keep = valid[left_indices, right_indices]
+        return left_indices[keep], right_indices[keep]
+
+    def disparities(self, left_boxes, right_boxes):
+        """Horizontal disparity of the box centers in original frame pixels."""
+        left_x = (left_boxes[..., 0] + left_boxes[..., 2]) / 2 + self.left_offset[0]
+        right_x = (right_boxes[..., 0] + right_boxes[..., 2]) / 2 + self.right_offset[0]
+        return left_x - right_x
+
+    def triangulate(self, left_boxes, right_boxes):
+        """
+        Triangulate matched box pairs into rig coordinates: the axes of the left camera with the
+        origin midway between the two cameras, so x = 0 is straight ahead of the rig.
+
+        :param left_boxes: Array of shape (K, 4) with the matched left boxes (cropped coordinates).
+        :param right_boxes: Array of shape (K, 4) with the matched right boxes (cropped coordinates).
+        :return: Array of shape (K, 3) with [x, y, z] in meters (x right, y down, z forward).
+        """
+        disparity = self.disparities(left_boxes, right_boxes)
+        depth = self.focal_length * self.baseline / disparity
+        centers = np.stack([
+            (left_boxes[:, 0] + left_boxes[:, 2]) / 2,
+            (left_boxes[:, 1] + left_boxes[:, 3]) / 2
+        ], axis=1) + self.left_offset
+        lateral = (centers - self.principal_point) * (depth / self.focal_length)[:, None]
+        # The right camera sits baseline meters to the right (+x) of the left one.
+        lateral[:, 0] -= self.baseline / 2
+        return np.column_stack([lateral, depth])
+
+    def fuse(self, left_detections, right_detections):
+        """
+        Build one obstacle list from the detections of both cameras.
+        Matched pairs get a triangulated 'position' [x, y, z] and their 'distance' is the
+        Euclidean distance to it, plus the smaller monocular distance of the pair as
+        'monocular_distance'; unmatched detections are passed through with their monocular
+        'distance' and no position.
+
+        :param left_detections: Left Detections (or a list of detection dictionaries).
+        :param right_detections: Right Detections (or a list of detection dictionaries).
+        :return: List of obstacle dictionaries with the keys 'label', 'camera' ('stereo',
+                 'left' or 'right'), 'position', 'distance', 'monocular_distance', 'confidence',
+                 'left_index', 'right_index' and 'track_id'.
+        """
+        left_detections = Detections.coerce(left_detections)
+        right_detections = Detections.coerce(right_detections)
+        left_boxes = left_detections.bbox
+        right_boxes = right_detections.bbox
+        if self.frame_scale != 1.0:
+            left_boxes = left_boxes / self.frame_scale
+            right_boxes = right_boxes / self.frame_scale
+        left_labels = left_detections.labels
+        right_labels = right_detections.labels
+
+        left_indices, right_indices = self.match(left_boxes, left_labels, right_boxes, right_labels)
+        positions = self.triangulate(left_boxes[left_indices], right_boxes[right_indices])
+        distances = np.linalg.norm(positions, axis=1)
+
+        obstacles = []
+        for left_index, right_index, position, distance in zip(
+            left_indices.tolist(), right_indices.tolist(), positions.tolist(), distances.tolist()
+        ):
+            left_det = left_detections[left_index]
+            right_det = right_detections[right_index]
+            monocular_distances = [d for d in (left_det.get("distance"), right_det.get("distance")) if d is not None]
+            obstacles.append({
+                "label": left_det["label"],
+                "camera": "stereo",
+                "position": position,
+                "distance": distance,
+                "monocular_distance": min(monocular_distances) if monocular_distances else None,
+                "confidence": (left_det.get("confidence", 0) + right_det.get("confidence", 0)) / 2,
+                "left_index": left_index,
+                "right_index": right_index,
+                "track_id": left_det.get("track_id")
+            })
+
+        matched_left = set(left_indices.tolist())
+        matched_right = set(right_indices.tolist())
+        for camera, detections, matched in (("left", left_detections, matched_left),
+                                            ("right", right_detections, matched_right)):
+            for index, det in enumerate(detections):
+                if index in matched:
+                    continue
+                obstacles.append({
+                    "label": det["label"],
+                    "camera": camera,
+                    "position": None,
+                    "distance": det.get("distance"),
+                    "monocular_distance": det.get("distance"),
+                    "confidence": det.get("confidence", 0),
+                    "left_index": index if camera == "left" else None,
+                    "right_index": index if camera == "right" else None,
+                    "track_id": det.get("track_id")
+                })
+        return obstacles
@@ -0,0 +1,31 @@
+from ultralytics import YOLO
+from robot_navigation.detection.detector_backend import DetectorBackend, empty_detections
+
+class UltralyticsBackend(DetectorBackend):
+    name = "ultralytics"
+
+    def __init__(self, model_path, device='cuda', confidence_threshold=0.25, iou_threshold=0.7):
+        """
+        Ultralytics YOLO inference, e.g. of a TensorRT .engine on the GPU.
+
+        :param device: Device passed to YOLO.predict ('cuda', 'cpu', ...).
+        """
+        self.model = YOLO(model_path, task='detect')
+        self.device = device
+        self.confidence_threshold = confidence_threshold
+        self.iou_threshold = iou_threshold
+
+    def predict(self, frames):
+        results = self.model.predict(
+            list(frames), stream=False, device=self.device, conf=self.confidence_threshold,
+            iou=self.iou_threshold, verbose=False
+        )
+        detections = []
+        for result in results:
+            if result.boxes is None:
+                detections.append(empty_detections())
+                continue
+            # boxes.data is [x1, y1, x2, y2, (track_id,) conf, cls] per row; one transfer to the host.
+            data = result.boxes.data.cpu().numpy()
+            detections.append(data[:, [0, 1, 2, 3, -2, -1]])
+        return detections
@@ -1,54 +1,58 @@
-from ultralytics import YOLO
-from robot_navigation.config import CLASS_MAPPING
+import numpy as np
+from robot_navigation.data.detections import Detections
+from robot_navigation.detection.detection_history import DetectionHistory
+from robot_navigation.detection.detector_backend import DetectorBackend, create_detector_backend
+from robot_navigation.detection.iou import pairwise_iou
 
 class YoloDetector:
-    def __init__(self, model_path, detection_memory_size=5, memory_threshold=2, iou_threshold=0.3):
+    def __init__(self, model_path, detection_memory_size=5, memory_threshold=2, iou_threshold=0.3,
+                 backend="ultralytics", **backend_options):
         """
         :param detection_memory_size: Number of frames to remember for temporal smoothing.
         :param memory_threshold: Minimum number of past frames in which a similar detection must appear.
-        :param iou_threshold: IoU threshold to consider two detections as matching.
+        :param iou_threshold: IoU threshold to consider two detections of consecutive frames as matching
+                              (temporal filter, not the non-maximum suppression of the backend).
+        :param backend: Inference backend name (see create_detector_backend) or a DetectorBackend.
+        :param backend_options: Passed to create_detector_backend (device, nms_iou_threshold, threads, ...).
         """
-        self.model = YOLO(model_path, task='detect')
-        # Maintain separate detection histories per camera (e.g., 'left' and 'right')
+        if isinstance(backend, DetectorBackend):
+            self.backend = backend
+        else:
+            self.backend = create_detector_backend(backend, model_path, **backend_options)
+        # Maintain separate detection ring buffers per camera (e.g., 'left' and 'right')
         self.detection_history = {}
         self.detection_memory_size = detection_memory_size
         self.memory_threshold = memory_threshold
         self.iou_threshold = iou_threshold
 
     def predict(self, frame):
-        """Run inference on a frame."""
-        return self.model.predict(frame, stream=False, device='cuda', verbose=False)
+        """
+        Run inference on a frame, or on a list of frames as one batch.
+        :return: One float array of shape (N, 6) with [x1, y1, x2, y2, confidence, class_id] per frame.
+        """
+        return self.backend.predict(frame if isinstance(frame, list) else [frame])
 
     def extract_detections(self, frame, predictions):
         """
-        Given a YOLO result as predictions, extract a list of dictionaries for each detection.
-        Each dictionary contains:
-        - label: the detected class label
-        - bbox: [x1, y1, x2, y2] (in pixels)
-        - confidence: confidence score (float)
-        - camera_width, camera_height: for computing relative area
+        Given the predictions of one frame, either a (N, 6) array from the backend or an
+        Ultralytics result, return the detections of the frame as Detections (bbox, confidence
+        and class_id arrays; the frame size is kept for relative sizes).
         """
-        detections = []
-        if not hasattr(predictions, 'boxes') or predictions.boxes is None:
-            return detections
-
-        frame_width = frame.shape[1]
-        frame_height = frame.shape[0]
-
-        for box in predictions.boxes:
-            xyxy = box.xyxy[0].cpu().numpy().tolist()  # [x1, y1, x2, y2]
-            conf = float(box.conf[0])
-            cls_id = int(box.cls[0])
-            label = CLASS_MAPPING.get(cls_id, str(cls_id))
-
-            detections.append({
-                "label": label,
-                "bbox": xyxy,
-                "confidence": conf,
-                "camera_width": frame_width,
-                "camera_height": frame_height
-            })
-        return detections
+        if isinstance(predictions, np.ndarray):
+            data = predictions.reshape(-1, 6)
+        elif not hasattr(predictions, 'boxes') or predictions.boxes is None:
+            data = np.empty((0, 6), dtype=np.float32)
+        else:
+            # boxes.data is [x1, y1, x2, y2, (track_id,) conf, cls] per row.
+            data = predictions.boxes.data.cpu().numpy()
+
+        return Detections(
+            bbox=data[:, :4],
+            confidence=data[:, -2],
+            class_id=data[:, -1].astype(np.int64),
+            frame_width=frame.shape[1],
+            frame_height=frame.shape[0]
+        )
 
     @staticmethod
     def compute_iou(bbox1, bbox2):
@@ -66,34 +70,6 @@ class YoloDetector:
             return 0.0
         return intersection_area / union_area
 
-    def smooth_box_size(self, detection, history):
-        """
-        Smooth only the size of the bbox (width and height) by averaging over matching detections 
-        in the history, while keeping the current center intact.
-        """
-        x1, y1, x2, y2 = detection["bbox"]
-        center = [(x1 + x2) / 2, (y1 + y2) / 2]
-        widths = []
-        heights = []
-        for frame in history:
-            for det in frame:
-                if det["label"] == detection["label"]:
-                    if self.compute_iou(detection["bbox"], det["bbox"]) >= self.iou_threshold:
-                        bw = det["bbox"][2] - det["bbox"][0]
-                        bh = det["bbox"][3] - det["bbox"][1]
-                        widths.append(bw)
-                        heights.append(bh)
-                        break  # Only one match per frame.
-        if widths and heights:
-            avg_width = sum(widths) / len(widths)
-            avg_height = sum(heights) / len(heights)
-            new_x1 = center[0] - avg_width / 2
-            new_y1 = center[1] - avg_height / 2
-            new_x2 = center[0] + avg_width / 2
-            new_y2 = center[1] + avg_height / 2
-            return [new_x1, new_y1, new_x2, new_y2]
-        return detection["bbox"]
-
     def detect(self, frame, camera_id):
         """
         Detect objects in a given frame from a specific camera.
@@ -102,32 +78,133 @@ class YoloDetector:
         """
         predictions = self.predict(frame)
         current_detections = self.extract_detections(frame, predictions[0])
-        
+        return self.filter_detections(current_detections, camera_id)
+
+    def detect_batch(self, frames, camera_ids):
+        """
+        Detect objects in several frames (e.g. a left/right pair) with a single model call.
+        The frames are sent through the model as one batch, temporal filtering is then
+        applied per camera exactly as in detect().
+        :param frames: List of input image frames.
+        :param camera_ids: List of camera identifiers, one per frame.
+        :return: List of Detections, in the same order as frames.
+        """
+        if len(frames) != len(camera_ids):
+            raise ValueError("detect_batch requires one camera_id per frame.")
+        predictions = self.predict(list(frames))
+        return [
+            self.filter_detections(self.extract_detections(frame, prediction), camera_id)
+            for frame, prediction, camera_id in zip(frames, predictions, camera_ids)
+        ]
+
+    def filter_detections(self, current_detections, camera_id):
+        """
+        Apply temporal consistency filtering to the detections of one camera frame.
+        A detection is kept if a detection with the same label and an IoU of at least
+        iou_threshold appears in at least memory_threshold of the past frames. The size
+        of a kept bbox is smoothed by averaging the first matching box of every frame in
+        the history (the current frame included), while keeping the current center.
+        :param current_detections: Detections extracted from the current frame (a list of
+                                   detection dictionaries is converted).
+        :param camera_id: Identifier for the camera (e.g., 'left' or 'right').
+        :return: The kept Detections with smoothed boxes.
+        """
+        current_detections = Detections.coerce(current_detections)
+
         # Initialize history for camera if not present
         if camera_id not in self.detection_history:
-            self.detection_history[camera_id] = []
-        
+            self.detection_history[camera_id] = DetectionHistory(self.detection_memory_size)
+        history = self.detection_history[camera_id]
+
+        current_boxes = current_detections.bbox
+        # Class ids map one to one to labels, so they serve as label codes.
+        current_labels = current_detections.class_id
+
         # Update detection history for this camera
-        self.detection_history[camera_id].append(current_detections)
-        if len(self.detection_history[camera_id]) > self.detection_memory_size:
-            self.detection_history[camera_id].pop(0)
-        
+        history.append(current_boxes, current_labels)
+
         # For initial frames, return current detections to bootstrap memory.
-        if len(self.detection_history[camera_id]) < self.detection_memory_size:
+        if len(history) < self.detection_memory_size or not current_detections:
             return current_detections
-        
-        # Filter detections based on temporal consistency for this camera.
-        filtered_detections = []
-        for det in current_detections:
-            consistent_count = 0
-            for past_frame in self.detection_history[camera_id][:-1]:
-                for past_det in past_frame:
-                    if past_det["label"] == det["label"]:
-                        if self.compute_iou(det["bbox"], past_det["bbox"]) >= self.iou_threshold:
-                            consistent_count += 1
-                            break  # Only count one match per past frame.
-            if consistent_count >= self.memory_threshold:
-                # Only smooth the box size while keeping the current center.
-                det["bbox"] = self.smooth_box_size(det, self.detection_history[camera_id])
-                filtered_detections.append(det)
+
+        boxes, labels = history.window()
+        past_boxes = boxes[:-1]
+        past_labels = labels[:-1]
+
+        # First match per past frame: (detections, past frames, boxes per frame).
+        matches = (past_labels[None] == current_labels[:, None, None]) & (
+            pairwise_iou(current_boxes[:, None, None, :], past_boxes[None]) >= self.iou_threshold
+        )
+        matched = matches.any(axis=2)
+        first_match = matches.argmax(axis=2)
+        consistent_counts = matched.sum(axis=1)
+        keep = np.flatnonzero(consistent_counts >= self.memory_threshold)
+        if len(keep) == 0:
+            return current_detections[keep]
+
+        # Accumulate matched sizes frame by frame (oldest first) to keep the summation order.
+        matched_boxes = past_boxes[np.arange(len(past_boxes)), first_match[keep]]
+        matched_widths = np.where(matched[keep], matched_boxes[..., 2] - matched_boxes[..., 0], 0.0)
+        matched_heights = np.where(matched[keep], matched_boxes[..., 3] - matched_boxes[..., 1], 0.0)
+        width_sums = np.zeros(len(keep))
+        height_sums = np.zeros(len(keep))
+        for frame_index in range(len(past_boxes)):
+            width_sums += matched_widths[:, frame_index]
+            height_sums += matched_heights[:, frame_index]
+        match_counts = matched[keep].sum(axis=1)
+
+        # The current frame comes last in the history. Its first match may be an earlier kept
+        # detection of this frame whose box has already been smoothed. Every row only depends
+        # on the rows before it, so iterating to a fixed point reproduces the in-order result.
+        kept_boxes = current_boxes[keep]
+        centers_x = (kept_boxes[:, 0] + kept_boxes[:, 2]) / 2
+        centers_y = (kept_boxes[:, 1] + kept_boxes[:, 3]) / 2
+        same_label = current_labels[keep][:, None] == current_labels[None, :]
+        kept_mask = np.zeros(len(current_boxes), dtype=bool)
+        kept_mask[keep] = True
+        uses_smoothed = (np.arange(len(current_boxes))[None, :] < keep[:, None]) & kept_mask[None, :]
+        depends_on = same_label & uses_smoothed
+        working_boxes = current_boxes.copy()
+        rows = np.arange(len(keep))
+        for _ in range(len(keep) + 1):
+            candidates = np.where(uses_smoothed[rows, :, None], working_boxes[None], current_boxes[None])
+            current_matches = same_label[rows] & (
+                pairwise_iou(kept_boxes[rows, None, :], candidates) >= self.iou_threshold
+            )
+            has_current = current_matches.any(axis=1)
+            current_match = candidates[np.arange(len(rows)), current_matches.argmax(axis=1)]
+            width_total = width_sums[rows] + np.where(has_current, current_match[:, 2] - current_match[:, 0], 0.0)
+            height_total = height_sums[rows] + np.where(has_current, current_match[:, 3] - current_match[:, 1], 0.0)
+            total_counts = match_counts[rows] + has_current
+            # Only smooth the box size while keeping the current center.
+            with np.errstate(invalid='ignore', divide='ignore'):
+                avg_width = width_total / total_counts
+                avg_height = height_total / total_counts
+            row_boxes = np.where(
+                (total_counts > 0)[:, None],
+                np.stack([
+                    centers_x[rows] - avg_width / 2, centers_y[rows] - avg_height / 2,
+                    centers_x[rows] + avg_width / 2, centers_y[rows] + avg_height / 2
+                ], axis=1),
+                kept_boxes[rows]
+            )
+            previous_boxes = working_boxes[keep[rows]]
+            changed = ~np.all(
+                (row_boxes == previous_boxes) | (np.isnan(row_boxes) & np.isnan(previous_boxes)), axis=1
+            )
+            if not changed.any():
+                break
+            working_boxes[keep[rows[changed]]] = row_boxes[changed]
+            # Only rows that match against a box that just changed need another pass.
+            changed_mask = np.zeros(len(current_boxes), dtype=bool)
+            changed_mask[keep[rows[changed]]] = True
+            rows = np.flatnonzero((depends_on & changed_mask[None, :]).any(axis=1))
+            if len(rows) == 0:
+                break
+        smoothed = working_boxes[keep]
+
+        history.update_latest(keep, smoothed)
+
+        filtered_detections = current_detections[keep]
+        filtered_detections.bbox = smoothed
         return filtered_detections
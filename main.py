@@ -4,39 +4,83 @@ import cv2
 import threading
 import time
 
-from robot_navigation.config import DISTANCES_PATH, MODEL_PATH, CROP_PATH
+from robot_navigation.config import (
+    DISTANCES_PATH, MODEL_PATH, ONNX_MODEL_PATH, CROP_PATH, STEREO_BASELINE, FOCAL_LENGTH_PX,
+    CAPTURE_SYNCHRONIZED, CAPTURE_RING_SIZE, CAPTURE_SYNC_TOLERANCE, CAPTURE_CROP, CAPTURE_RESIZE, CROP_BACKEND,
+    PIPELINED_PROCESSING, PIPELINE_QUEUE_SIZE, PROFILING_ENABLED, PROFILING_TRACE_PATH, RECORDING_PATH,
+    NAVIGATOR_EVENT_DRIVEN, NAVIGATOR_MIN_COMMAND_PERIOD, NAVIGATOR_MAX_COMMAND_PERIOD, DISPLAY_MAX_FPS,
+    NAVIGATOR_MAX_DATA_AGE,
+    DETECTOR_BACKEND, DETECTOR_DEVICE, DETECTOR_CONFIDENCE, DETECTOR_NMS_IOU, DETECTOR_INPUT_SIZE, DETECTOR_THREADS,
+    DETECTOR_PROVIDERS,
+    HEADLESS, PREVIEW_HOST, PREVIEW_PORT, PREVIEW_MAX_FPS, PREVIEW_SCALE, PREVIEW_JPEG_QUALITY,
+    PREVIEW_TOKEN
+)
 from robot_navigation.camera.dual_camera_capture import DualCameraCapture
-from robot_navigation.camera.frame_cropper_pytorch import FrameCropper
+from robot_navigation.camera.frame_cropper_auto import FrameCropper
+from robot_navigation.camera.frame_transform import FrameTransform
 from robot_navigation.data.metrics_loader import MetricsLoader
 from robot_navigation.data.sensor_data_hub import SensorDataHub
+from robot_navigation.data.sensor_data_recorder import SensorDataRecorder
 from robot_navigation.detection.distance_estimator import DistanceEstimator
+from robot_navigation.detection.stereo_triangulator import StereoTriangulator
+from robot_navigation.detection.detector_backend import resolve_detector_backend
 from robot_navigation.detection.yolo_detector import YoloDetector
 from robot_navigation.visualizing.frame_visualizer import FrameVisualizer
 from robot_navigation.processing.processing_pipeline_manager import ProcessingPipelineManager
+from robot_navigation.processing.pipeline_profiler import PipelineProfiler
 from robot_navigation.processing.detection_processor import DetectionProcessor
 from robot_navigation.processing.distance_estimation_processor import DistanceEstimationProcessor
 from robot_navigation.processing.tracking_processor import TrackingProcessor
+from robot_navigation.processing.stereo_fusion_processor import StereoFusionProcessor
 from robot_navigation.processing.visualizing_processor import VisualizingProcessor
 from robot_navigation.network.websocket_client import WebSocketClient
 from robot_navigation.navigation.autonomous_navigator import AutonomousNavigator
 from robot_navigation.navigation.reactive_behavior_strategy import ReactiveBehaviorStrategy
 from robot_navigation.rendering.dual_camera_renderer import DualCameraRenderer
 from robot_navigation.rendering.sensor_data_renderer import SensorDataRenderer
+from robot_navigation.rendering.mjpeg_preview_server import MjpegPreviewServer
 from robot_navigation.tracking.deepsort_tracker import DeepSortTracker
 
-def frame_processing_loop(capture, processing_pipeline_manager: ProcessingPipelineManager, frame_cropper, stop_event):
-    """Continuously process frames and update the SensorDataHub."""
+def frame_processing_loop(capture, processing_pipeline_manager: ProcessingPipelineManager, frame_cropper, stop_event,
+                          report_interval=10.0):
+    """Process every new frame pair once and update the SensorDataHub."""
+    last_pair = None
+    processed_pairs = 0
+    skipped_frames = [0, 0]
+    last_report = time.monotonic()
     while not stop_event.is_set():
         try:
-            left_frame = capture.frames.get(0)
-            right_frame = capture.frames.get(1)
+            # Wake up only when both cameras have delivered a frame we have not processed yet.
+            pair = capture.wait_for_pair(newer_than=last_pair, timeout=0.5)
+            if pair is None:
+                continue
 
-            if left_frame is not None and right_frame is not None:
-                left_frame, right_frame = frame_cropper.crop_frames(left_frame, right_frame)
-                if left_frame is not None and right_frame is not None:
-                    processing_pipeline_manager.process_and_update(left_frame, right_frame)
+            if last_pair is not None:
+                skipped_frames[0] += pair.left_sequence - last_pair.left_sequence - 1
+                skipped_frames[1] += pair.right_sequence - last_pair.right_sequence - 1
+            last_pair = pair
+
+            if frame_cropper is not None:
+                with processing_pipeline_manager.profiler.span("crop"):
+                    left_frame, right_frame = frame_cropper.crop_frames(pair.left_frame, pair.right_frame)
             else:
-                time.sleep(0.01)
+                # The capture threads already cropped the frames.
+                left_frame, right_frame = pair.left_frame, pair.right_frame
+            if left_frame is not None and right_frame is not None:
+                processing_pipeline_manager.process_and_update(
+                    left_frame, right_frame, sequence=pair.sequence, capture_timestamp=pair.timestamp
+                )
+                processed_pairs += 1
+
+            now = time.monotonic()
+            if now - last_report >= report_interval:
+                print(f"Processed {processed_pairs} frame pairs, skipped frames: "
+                      f"left {skipped_frames[0]}, right {skipped_frames[1]}", flush=True)
+                if processing_pipeline_manager.profiler.enabled:
+                    processing_pipeline_manager.profiler.report()
+                processed_pairs = 0
+                skipped_frames = [0, 0]
+                last_report = now
         
         except Exception as e:
             print(f"Error in processing loop: {e}")
@@ -44,9 +88,11 @@ def frame_processing_loop(capture, processing_pipeline_manager: ProcessingPipeli
 
 def main():
     # Parse command-line arguments or set default values.
-    robot_ip = sys.argv[1] if len(sys.argv) > 1 else "192.168.129.84"
-    stream_port = int(sys.argv[2]) if len(sys.argv) > 2 else 8554
-    ws_port = int(sys.argv[3]) if len(sys.argv) > 3 else 8000
+    headless = HEADLESS or "--headless" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--headless"]
+    robot_ip = args[0] if len(args) > 0 else "192.168.129.84"
+    stream_port = int(args[1]) if len(args) > 1 else 8554
+    ws_port = int(args[2]) if len(args) > 2 else 8000
 
     stop_event = threading.Event()
 
@@ -55,17 +101,43 @@ def main():
     metrics = metrics_loader.load_metrics()
 
     # Initialize object detection model
-    detector = YoloDetector(MODEL_PATH)
+    detector_backend = resolve_detector_backend(DETECTOR_BACKEND)
+    print(f"Using {detector_backend} detector backend")
+    detector = YoloDetector(
+        ONNX_MODEL_PATH if detector_backend == "onnxruntime" else MODEL_PATH,
+        backend=detector_backend,
+        device=DETECTOR_DEVICE,
+        confidence_threshold=DETECTOR_CONFIDENCE,
+        nms_iou_threshold=DETECTOR_NMS_IOU,
+        input_size=DETECTOR_INPUT_SIZE,
+        threads=DETECTOR_THREADS,
+        providers=DETECTOR_PROVIDERS
+    )
     distance_estimator = DistanceEstimator(metrics)
+    # Optionally crop and resize in the capture threads
+    transform = FrameTransform(CROP_PATH, long_side=CAPTURE_RESIZE) if CAPTURE_CROP else None
+    triangulator = StereoTriangulator(
+        CROP_PATH, STEREO_BASELINE, FOCAL_LENGTH_PX, frame_scale=transform.scale if transform else 1.0
+    )
 
     # Initialize camera capture
     stream1_url = f"rtsp://{robot_ip}:{stream_port}/cam0"
     stream2_url = f"rtsp://{robot_ip}:{stream_port}/cam1"
-    capture = DualCameraCapture(stream1_url, stream2_url)
+    capture = DualCameraCapture(
+        stream1_url, stream2_url,
+        synchronized=CAPTURE_SYNCHRONIZED,
+        ring_size=CAPTURE_RING_SIZE,
+        sync_tolerance=CAPTURE_SYNC_TOLERANCE,
+        transform=transform
+    )
     capture.start()
 
-    # Initialize frame cropper
-    cropper = FrameCropper(CROP_PATH)
+    # Initialize frame cropper (not needed if the capture crops). Without synchronized capture every
+    # frame is a new array, so the crops can be views; the frame rings are reused, so their crops go
+    # into pooled buffers.
+    cropper = None
+    if transform is None:
+        cropper = FrameCropper(CROP_PATH, backend=CROP_BACKEND, zero_copy=not CAPTURE_SYNCHRONIZED)
 
     # Initialize tracker (can be None if disabled)
     tracker = DeepSortTracker()
@@ -76,12 +148,24 @@ def main():
     # Create a shared sensor data hub
     sensor_data_hub = SensorDataHub()
 
+    # Optionally record everything published to the hub
+    recorder = None
+    if RECORDING_PATH:
+        recorder = SensorDataRecorder(RECORDING_PATH)
+        recorder.attach(sensor_data_hub)
+
     # Initialize Processing Pipeline Manager
-    processing_pipeline_manager = ProcessingPipelineManager(sensor_data_hub)
+    profiler = PipelineProfiler(enabled=PROFILING_ENABLED)
+    processing_pipeline_manager = ProcessingPipelineManager(
+        sensor_data_hub, pipelined=PIPELINED_PROCESSING, queue_size=PIPELINE_QUEUE_SIZE, profiler=profiler
+    )
     processing_pipeline_manager.register_module(DetectionProcessor(detector))
-    processing_pipeline_manager.register_module(DistanceEstimationProcessor(distance_estimator))
-    processing_pipeline_manager.register_module(TrackingProcessor(tracker))
+    # Distance, tracking and fusion are cheap, so they share one pipeline stage.
+    processing_pipeline_manager.register_module(DistanceEstimationProcessor(distance_estimator), stage="post")
+    processing_pipeline_manager.register_module(TrackingProcessor(tracker), stage="post")
+    processing_pipeline_manager.register_module(StereoFusionProcessor(triangulator), stage="post")
     processing_pipeline_manager.register_module(VisualizingProcessor(visualizer))
+    processing_pipeline_manager.start()
 
     # Start frame processing in a separate thread
     processing_thread = threading.Thread(
@@ -91,67 +175,113 @@ def main():
     )
     processing_thread.start()
 
-    # Initialize the renderer
-    dual_camera_renderer = DualCameraRenderer(window_name="Robot Navigation")
-    renderer = SensorDataRenderer(dual_camera_renderer)
-    cv2.namedWindow("Robot Navigation", cv2.WINDOW_NORMAL)
+    # Initialize the renderer (an OpenCV window, or the MJPEG preview server when headless)
+    if headless:
+        preview_server = MjpegPreviewServer(
+            sensor_data_hub, PREVIEW_HOST, PREVIEW_PORT, max_fps=PREVIEW_MAX_FPS, scale=PREVIEW_SCALE,
+            jpeg_quality=PREVIEW_JPEG_QUALITY, token=PREVIEW_TOKEN
+        )
+    else:
+        dual_camera_renderer = DualCameraRenderer(window_name="Robot Navigation", max_fps=DISPLAY_MAX_FPS)
+        renderer = SensorDataRenderer(dual_camera_renderer)
+        cv2.namedWindow("Robot Navigation", cv2.WINDOW_NORMAL)
 
     # Initialize WebSocket client
     ws_url = f"ws://{robot_ip}:{ws_port}/ws"
-    ws_client = WebSocketClient(ws_url)
+    # The navigator sends at least every NAVIGATOR_MAX_COMMAND_PERIOD (or every 0.5 s when polling);
+    # the client only keeps a command alive while it is refreshed, with one period of slack.
+    ws_client = WebSocketClient(ws_url, stale_after=2 * max(NAVIGATOR_MAX_COMMAND_PERIOD, 0.5))
 
     # Instantiate navigation strategy
     strategy = ReactiveBehaviorStrategy()
 
     # Initialize Autonomous Navigator
-    navigator = AutonomousNavigator(sensor_data_hub, ws_client, strategy, decision_interval=0.5)
+    navigator = AutonomousNavigator(
+        sensor_data_hub, ws_client, strategy, decision_interval=0.5,
+        event_driven=NAVIGATOR_EVENT_DRIVEN,
+        min_command_period=NAVIGATOR_MIN_COMMAND_PERIOD,
+        max_command_period=NAVIGATOR_MAX_COMMAND_PERIOD,
+        max_data_age=NAVIGATOR_MAX_DATA_AGE
+    )
 
-    print("Press ESC to exit.")
-    print("Press SPACE to toggle autonomous driving on/off.")
-    print("Press R to toggle rendering enriched with object detection.")
+    def toggle_autonomy():
+        navigator.enabled = not navigator.enabled
+        if not navigator.enabled:
+            ws_client.send_command(0, 0)
+        print("Autonomous mode:", "ENABLED" if navigator.enabled else "DISABLED")
+
+    quit_event = threading.Event()
 
     try:
-        while True:
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27:  # ESC key.
-                break
-
-            elif key == ord(' '):
-                navigator.enabled = not navigator.enabled
-                if not navigator.enabled:
-                    ws_client.send_command(0, 0)
-                print("Autonomous mode:", "ENABLED" if navigator.enabled else "DISABLED")
-
-            elif key == ord('r'):
-                renderer.render_enriched = not renderer.render_enriched
-                print("Display mode:", "ENRICHED" if renderer.render_enriched else "RAW")
-
-            sensor_data = sensor_data_hub.get_latest()
-            if sensor_data is not None:
-                #print("[DEBUG] rendering !")
-                renderer.show(sensor_data)
-            else:
-                #print("[DEBUG] no sensor data available !")
-                dual_camera_renderer.show(capture.frames)
+        if headless:
+            preview_server.add_command("autonomy", toggle_autonomy, lambda: navigator.enabled)
+            preview_server.add_command("quit", quit_event.set)
+            preview_server.start()
+            print("Press Ctrl+C or POST /command/quit to exit.")
+            print("POST /command/autonomy to toggle autonomous driving on/off.")
+            print("POST /command/enriched to toggle rendering enriched with object detection.")
+            while not quit_event.wait(0.5):
+                pass
+        else:
+            print("Press ESC to exit.")
+            print("Press SPACE to toggle autonomous driving on/off.")
+            print("Press R to toggle rendering enriched with object detection.")
+
+            while True:
+                # Block in waitKey until the next refresh is due instead of spinning.
+                key = cv2.waitKey(dual_camera_renderer.wait_ms()) & 0xFF
+                if key == 27:  # ESC key.
+                    break
+
+                elif key == ord(' '):
+                    toggle_autonomy()
+
+                elif key == ord('r'):
+                    renderer.render_enriched = not renderer.render_enriched
+                    print("Display mode:", "ENRICHED" if renderer.render_enriched else "RAW")
+
+                sensor_data = sensor_data_hub.get_latest()
+                if sensor_data is not None:
+                    #print("[DEBUG] rendering !")
+                    renderer.show(sensor_data)
+                else:
+                    #print("[DEBUG] no sensor data available !")
+                    dual_camera_renderer.show(capture.frames)
 
     except KeyboardInterrupt:
         print("Keyboard interrupt received, shutting down.")
     finally:
+        if headless:
+            preview_server.stop()
         # Signal the processing thread to stop
         stop_event.set()
         # Wait for the processing thread to finish
         if processing_thread.is_alive():
             processing_thread.join(timeout=2.0)
+        processing_pipeline_manager.stop()
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.recorded_frames} frames to {RECORDING_PATH} "
+                  f"({recorder.dropped_frames} dropped).")
+        if profiler.enabled and PROFILING_TRACE_PATH:
+            profiler.dump_chrome_trace(PROFILING_TRACE_PATH)
+            print(f"Chrome trace written to {PROFILING_TRACE_PATH}")
         # Clean up GPU resources
-        cropper.cleanup()
+        if cropper is not None:
+            cropper.cleanup()
 
         ws_client.send_command(0, 0)
         # If the navigator was started, stop it.
         if 'navigator' in locals():
             navigator.stop()
+            latency = navigator.decision_latency.percentiles()
+            if latency:
+                print(f"Capture-to-command latency: p50={latency['p50']:.1f}ms "
+                      f"p95={latency['p95']:.1f}ms p99={latency['p99']:.1f}ms")
         capture.stop()
         ws_client.close()
-        cv2.destroyAllWindows()
+        if not headless:
+            cv2.destroyAllWindows()
         print("System closed.")
 
 if __name__ == "__main__":
@@ -1,35 +1,124 @@
 import threading
 import time
+from robot_navigation.network.websocket_client import STOP_COMMAND
+from robot_navigation.processing.pipeline_profiler import LatencyHistogram
 
 class AutonomousNavigator:
-    def __init__(self, sensor_data_hub, ws_client, strategy, decision_interval=0.2):
+    def __init__(self, sensor_data_hub, ws_client, strategy, decision_interval=0.2, event_driven=False,
+                 min_command_period=0.05, max_command_period=0.5, max_data_age=0.5):
         """
         :param sensor_data_hub: Shared hub from which to retrieve the latest SensorData.
         :param ws_client: Instance of WebSocketClient.
         :param strategy: An instance of NavigationStrategy.
-        :param decision_interval: Time (in seconds) between decision updates.
+        :param decision_interval: Time (in seconds) between decision updates (polling mode).
+        :param event_driven: Decide as soon as new SensorData is published instead of polling.
+        :param min_command_period: Event-driven mode: minimum time (in seconds) between two commands.
+        :param max_command_period: Event-driven mode: if no new SensorData arrives within this time,
+                                   the last command is sent again. This refreshes the command for
+                                   the WebSocketClient keepalive, so it must stay below the client's
+                                   stale_after or the robot is stopped between perception results.
+        :param max_data_age: Commands are only sent (or repeated) while the SensorData they are based
+                             on is at most this old (seconds since capture). When perception stalls
+                             the robot is sent one stop command instead.
         """
         self.sensor_data_hub = sensor_data_hub
         self.ws_client = ws_client
         self.strategy = strategy
         self.decision_interval = decision_interval
+        self.event_driven = event_driven
+        self.min_command_period = min_command_period
+        self.max_command_period = max_command_period
+        self.max_data_age = max_data_age
+        # Time from frame capture to decision, recorded for every decision.
+        self.decision_latency = LatencyHistogram()
         self.running = True
         self.enabled = False  # Autonomous driving is off by default.
         self.thread = threading.Thread(target=self.run, daemon=True)
         self.thread.start()
 
+    def _decide(self, sensor_data):
+        left_speed, right_speed = self.strategy.decide(sensor_data)
+        if self.enabled:
+            self.ws_client.send_command(left_speed, right_speed)
+        now = time.monotonic()
+        if sensor_data.capture_timestamp is not None:
+            self.decision_latency.add(now - sensor_data.capture_timestamp, now)
+        return left_speed, right_speed
+
+    def _stop_robot(self):
+        """Send one stop command, e.g. when the perception data became too old to drive on."""
+        if self.enabled and self.running:
+            self.ws_client.send_command(*STOP_COMMAND)
+
+    def _is_stale(self, sensor_data, received_time):
+        """True if sensor_data, captured (or else received) at the given time, is older than max_data_age."""
+        reference = sensor_data.capture_timestamp if sensor_data.capture_timestamp is not None else received_time
+        return time.monotonic() - reference > self.max_data_age
+
     def run(self):
+        if self.event_driven:
+            self._run_event_driven()
+            return
+        last_data = None
+        received_time = None
+        stopped = True
         while self.running:
             sensor_data = self.sensor_data_hub.get_latest()
             if sensor_data is None:
                 time.sleep(self.decision_interval)
                 continue
+            if sensor_data is not last_data:
+                last_data, received_time = sensor_data, time.monotonic()
+            if self._is_stale(sensor_data, received_time):
+                # Perception stalled: do not keep driving on an old decision.
+                if not stopped:
+                    self._stop_robot()
+                    stopped = True
+                time.sleep(self.decision_interval)
+                continue
 
-            left_speed, right_speed = self.strategy.decide(sensor_data)
-            if self.enabled:
-                self.ws_client.send_command(left_speed, right_speed)
+            self._decide(sensor_data)
+            stopped = False
             time.sleep(self.decision_interval)
 
+    def _run_event_driven(self):
+        version = 0
+        last_command = None
+        last_command_time = float('-inf')
+        # SensorData the last command is based on, and when it was received.
+        last_data = None
+        last_data_time = None
+        while self.running:
+            new_version, sensor_data = self.sensor_data_hub.wait_for_update(version, timeout=self.max_command_period)
+            if sensor_data is None:
+                # No new perception result: repeat the last command as a keepalive, but only
+                # while the data it is based on is fresh.
+                if last_command is not None and self._is_stale(last_data, last_data_time):
+                    self._stop_robot()
+                    last_command = None
+                if self.enabled and last_command is not None and self.running:
+                    self.ws_client.send_command(*last_command)
+                continue
+
+            wait = self.min_command_period - (time.monotonic() - last_command_time)
+            if wait > 0:
+                time.sleep(wait)
+                # Decide on the newest data that arrived meanwhile.
+                new_version, sensor_data = self.sensor_data_hub.wait_for_update(version, timeout=0)
+            version = new_version
+            if not self.running:
+                break
+
+            last_data, last_data_time = sensor_data, time.monotonic()
+            if self._is_stale(sensor_data, last_data_time):
+                # Published too late to act on (e.g. a stalled pipeline catching up).
+                if last_command is not None:
+                    self._stop_robot()
+                    last_command = None
+                continue
+            last_command = self._decide(sensor_data)
+            last_command_time = time.monotonic()
+
     def stop(self):
         self.running = False
         self.thread.join()
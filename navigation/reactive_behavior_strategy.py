@@ -1,24 +1,52 @@
 from time import sleep
 from robot_navigation.navigation.navigation_strategy import NavigationStrategy
 from robot_navigation.data.sensor_data import SensorData
+from robot_navigation.data.detections import Detections
 
 # Define critical thresholds.
 SAFE_DISTANCE = 0.15  # Minimum safe distance in meters
 
 class ReactiveBehaviorStrategy(NavigationStrategy):
 
+    @staticmethod
+    def closest_obstacles(obstacles):
+        """
+        Closest obstacle distance on the left and on the right side from the fused obstacle list
+        (see StereoTriangulator.fuse). Stereo obstacles are assigned to a side by their lateral
+        position in the rig frame, obstacles seen by one camera only by that camera. Obstacles
+        without a distance are ignored.
+
+        The stereo distance relies on the uncalibrated STEREO_BASELINE and FOCAL_LENGTH_PX and
+        includes the vertical offset, so the smaller of it and the calibrated monocular distance
+        is used.
+
+        :return: Tuple (min_left_distance, min_right_distance), inf where a side is clear.
+        """
+        min_distances = {"left": float('inf'), "right": float('inf')}
+        for obstacle in obstacles:
+            distances = [d for d in (obstacle.get("distance"), obstacle.get("monocular_distance")) if d is not None]
+            if not distances:
+                continue
+            distance = min(distances)
+            if obstacle["camera"] == "stereo":
+                side = "left" if obstacle["position"][0] < 0 else "right"
+            else:
+                side = obstacle["camera"]
+            min_distances[side] = min(min_distances[side], distance)
+        return min_distances["left"], min_distances["right"]
+
     def decide(self, sensor_data: SensorData) -> tuple[float, float]:
         # Default: STOP the robot when no detections available or no decision can be made:
         left_cmd = 0.0
         right_cmd = 0.0
 
-        # Extract detected distances
-        left_distances = [det["distance"] for det in sensor_data.left_detections]
-        right_distances = [det["distance"] for det in sensor_data.right_detections]
-
         # Get the closest obstacle on each side
-        min_left_distance = min(left_distances, default=float('inf'))
-        min_right_distance = min(right_distances, default=float('inf'))
+        if sensor_data.obstacles:
+            min_left_distance, min_right_distance = self.closest_obstacles(sensor_data.obstacles)
+        else:
+            # No fused obstacle list (stereo fusion disabled or nothing detected).
+            min_left_distance = Detections.coerce(sensor_data.left_detections).min_distance()
+            min_right_distance = Detections.coerce(sensor_data.right_detections).min_distance()
 
         #print(f"[DEBUG] Min Left Distance: {min_left_distance}, Min Right Distance: {min_right_distance}", flush=True)
 
@@ -0,0 +1,129 @@
+"""
+Local stand-in for the robot's WebSocket command endpoint.
+
+Accepts the same {"left": .., "right": ..} commands on /ws, applies them after a configurable
+delay and drops a configurable share of them. Commands carrying a "seq" are answered with
+{"ack": seq, "t": .., "robot_time": ..}. It can also drop connections periodically to exercise
+the client's reconnect logic:
+
+    python -m robot_navigation.network.robot_stand_in_server --port 8000 --delay 20 --loss 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import websockets
+
+class RobotStandInServer:
+    def __init__(self, host="127.0.0.1", port=8000, delay=0.0, jitter=0.0, loss=0.0, disconnect_every=None,
+                 seed=None):
+        """
+        :param host: Interface to listen on.
+        :param port: Port to listen on.
+        :param delay: One-way delay in seconds before a command is applied and acknowledged.
+        :param jitter: Additional uniformly distributed delay in seconds.
+        :param loss: Probability of silently dropping a command.
+        :param disconnect_every: Close every connection after this many seconds (None keeps them open).
+        :param seed: Seed for loss and jitter.
+        """
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self.disconnect_every = disconnect_every
+        self.random = random.Random(seed)
+        # Last applied wheel speeds and counters.
+        self.left = 0.0
+        self.right = 0.0
+        self.received_commands = 0
+        self.dropped_commands = 0
+        self.applied_commands = 0
+        self.connections = 0
+        self.loop = None
+        self.thread = None
+        self._stop = None
+
+    async def _apply(self, ws, command):
+        await asyncio.sleep(self.delay + self.random.uniform(0.0, self.jitter))
+        self.left = command.get("left", 0.0)
+        self.right = command.get("right", 0.0)
+        self.applied_commands += 1
+        if "seq" in command:
+            try:
+                await ws.send(json.dumps({"ack": command["seq"], "t": command.get("t"), "robot_time": time.time()}))
+            except websockets.ConnectionClosed:
+                pass
+
+    async def _handler(self, ws, path=None):
+        self.connections += 1
+        if self.disconnect_every:
+            asyncio.get_running_loop().call_later(self.disconnect_every, lambda: asyncio.ensure_future(ws.close()))
+        try:
+            async for message in ws:
+                self.received_commands += 1
+                try:
+                    command = json.loads(message)
+                except ValueError:
+                    continue
+                if self.random.random() < self.loss:
+                    self.dropped_commands += 1
+                    continue
+                # Apply concurrently, so a delay does not hold back later commands.
+                asyncio.ensure_future(self._apply(ws, command))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def serve(self):
+        """Serve until stop() is called."""
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port):
+            await self._stop.wait()
+
+    def start(self):
+        """Run the server on a background thread."""
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.loop.call_soon(ready.set)
+            self.loop.run_until_complete(self.serve())
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait()
+        # Give the listening socket a moment to come up.
+        time.sleep(0.1)
+
+    def stop(self):
+        if self.loop is not None and self._stop is not None:
+            self.loop.call_soon_threadsafe(self._stop.set)
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the robot's WebSocket endpoint.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--delay', type=float, default=0.0, help="One-way delay in ms.")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Additional random delay in ms.")
+    parser.add_argument('--loss', type=float, default=0.0, help="Probability of dropping a command.")
+    parser.add_argument('--disconnect-every', type=float, default=None, help="Drop connections every N seconds.")
+    args = parser.parse_args()
+
+    server = RobotStandInServer(
+        args.host, args.port, delay=args.delay / 1000.0, jitter=args.jitter / 1000.0, loss=args.loss,
+        disconnect_every=args.disconnect_every
+    )
+    print(f"Robot stand-in listening on ws://{args.host}:{args.port}/ws")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print(f"Received {server.received_commands}, dropped {server.dropped_commands}, "
+              f"applied {server.applied_commands} commands.")
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,76 @@ import asyncio
 import websockets
 import json
 import threading
+import time
+from robot_navigation.processing.pipeline_profiler import LatencyHistogram
+
+STOP_COMMAND = (0, 0)
 
 class WebSocketClient:
-    def __init__(self, ws_url):
+    def __init__(self, ws_url, min_send_interval=0.02, keepalive_interval=0.5, stale_after=0.5,
+                 initial_backoff=0.5, max_backoff=8.0, acknowledged=False, ack_timeout=0.5):
+        """
+        WebSocket command channel to the robot.
+
+        Commands are coalesced: only the newest (left, right) pair is kept pending, and a single
+        sender task on the event loop transmits it. Consecutive identical commands are suppressed
+        except for a keepalive every keepalive_interval, and sends are spaced by at least
+        min_send_interval. The keepalive only repeats a command the caller refreshed within
+        stale_after; once the caller goes quiet a single stop is sent instead. Reconnects use
+        exponential backoff, pending commands older than stale_after are discarded instead of
+        being sent after a reconnect, and commands sent before a disconnect are never repeated.
+
+        :param ws_url: URL of the robot's WebSocket endpoint.
+        :param min_send_interval: Minimum time in seconds between two sent commands.
+        :param keepalive_interval: Resend the last command after this many seconds without a send.
+        :param stale_after: Maximum age in seconds of a pending command that may still be sent, and
+                            of the caller's last command that the keepalive may still repeat. Must
+                            be longer than the caller's command period.
+        :param initial_backoff: First reconnect delay in seconds.
+        :param max_backoff: Maximum reconnect delay in seconds.
+        :param acknowledged: Add a sequence number ("seq") and send time ("t") to every command and
+                             expect the robot to answer {"ack": seq}; used for round-trip telemetry.
+        :param ack_timeout: Commands without an ack after this many seconds count as lost; acks
+                            that arrive later count as late.
+        """
         self.ws_url = ws_url
         self.ws = None
+        self.min_send_interval = min_send_interval
+        self.keepalive_interval = keepalive_interval
+        self.stale_after = stale_after
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        # Latest command (left, right, time.monotonic()) not yet handled by the sender.
+        self._pending = None
+        self._pending_lock = threading.Lock()
+        self._last_sent = None
+        self._last_send_time = float('-inf')
+        # Time of the caller's newest send_command() call.
+        self._last_command_time = float('-inf')
+        self.sent_commands = 0
+        self.suppressed_commands = 0
+        self.coalesced_commands = 0
+        self._closing = False
+
+        self.acknowledged = acknowledged
+        self.ack_timeout = ack_timeout
+        self.round_trip_times = LatencyHistogram()
+        self.acked_commands = 0
+        self.lost_commands = 0
+        self.late_commands = 0
+        self._next_sequence = 0
+        # Send time per sequence number of commands waiting for an ack, and of expired ones.
+        self._awaiting_ack = {}
+        self._expired_acks = {}
+
         self.loop = asyncio.new_event_loop()
+        self._command_event = asyncio.Event()
+        self._disconnected = asyncio.Event()
         self.thread = threading.Thread(target=self.run_loop, daemon=True)
         self.thread.start()
-        asyncio.run_coroutine_threadsafe(self.connect(), self.loop)
+        asyncio.run_coroutine_threadsafe(self._connection_manager(), self.loop)
+        self._sender_task = asyncio.run_coroutine_threadsafe(self._command_sender(), self.loop)
 
     def run_loop(self):
         asyncio.set_event_loop(self.loop)
@@ -21,28 +82,166 @@ class WebSocketClient:
             # Disable automatic pings to avoid keepalive ping timeout errors.
             self.ws = await websockets.connect(self.ws_url, ping_interval=None)
             print("Connected to robot WebSocket.")
+            if self.acknowledged:
+                asyncio.ensure_future(self._receive_acks(self.ws))
+            return True
         except Exception as e:
             print(f"Failed to connect to WebSocket: {e}")
             self.ws = None
+            return False
+
+    async def _connection_manager(self):
+        """Keep the connection up, retrying with exponential backoff."""
+        backoff = self.initial_backoff
+        while not self._closing:
+            if self.ws is None:
+                if await self.connect():
+                    backoff = self.initial_backoff
+                    self._disconnected.clear()
+                    # Let the sender flush a still fresh pending command.
+                    self._command_event.set()
+                else:
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+                    continue
+            await self._disconnected.wait()
 
     def send_command(self, left, right):
-        if self.ws:
-            coro = self._send_command(left, right)
-            asyncio.run_coroutine_threadsafe(coro, self.loop)
+        """Set the newest command; never blocks and never queues older commands."""
+        with self._pending_lock:
+            if self._pending is not None:
+                self.coalesced_commands += 1
+            self._pending = (left, right, time.monotonic())
+            self._last_command_time = self._pending[2]
+        self.loop.call_soon_threadsafe(self._command_event.set)
+
+    def _take_pending(self):
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = None
+        return pending
+
+    async def _command_sender(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._command_event.wait(), timeout=self.keepalive_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._command_event.clear()
+            if self.acknowledged:
+                self._expire_acks()
+
+            # Rate limit: wait out the minimum interval, more commands may coalesce meanwhile.
+            wait = self.min_send_interval - (time.monotonic() - self._last_send_time)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self._send_next()
+
+    async def _send_next(self):
+        now = time.monotonic()
+        pending = self._take_pending()
+        if pending is not None and now - pending[2] > self.stale_after:
+            pending = None  # Too old to act on, e.g. it waited for a reconnect.
+        if pending is not None:
+            command = pending[:2]
+            if command == self._last_sent and now - self._last_send_time < self.keepalive_interval:
+                self.suppressed_commands += 1
+                return
+        elif self._last_sent is not None and now - self._last_send_time >= self.keepalive_interval:
+            if now - self._last_command_time <= self.stale_after:
+                command = self._last_sent  # Keepalive of a command the caller still refreshes.
+            elif self._last_sent != STOP_COMMAND:
+                command = STOP_COMMAND  # The caller went quiet: stop once instead of driving on.
+            else:
+                return
         else:
-            print("WebSocket not connected, cannot send command.")
+            return
+        await self._send_command(*command)
 
     async def _send_command(self, left, right):
+        if self.ws is None:
+            return
         try:
-            command = json.dumps({"left": left, "right": right})
+            message = {"left": left, "right": right}
+            if self.acknowledged:
+                self._next_sequence += 1
+                message["seq"] = self._next_sequence
+                message["t"] = time.time()
+                self._awaiting_ack[self._next_sequence] = time.monotonic()
+            command = json.dumps(message)
             await self.ws.send(command)
-            print(f"Sent command: {command}")
+            self._last_sent = (left, right)
+            self._last_send_time = time.monotonic()
+            self.sent_commands += 1
         except Exception as e:
             print(f"Error sending command: {e}")
-            # Attempt to reconnect.
-            await self.connect()
+            # A command that never left cannot be acknowledged.
+            self._awaiting_ack.pop(self._next_sequence, None)
+            # Hand the reconnect over to the connection manager; never repeat an old command after it.
+            self._last_sent = None
+            self.ws = None
+            self._disconnected.set()
 
-    def close(self):
+    async def _receive_acks(self, ws):
+        """Read acks from the robot and record the round-trip times."""
+        try:
+            async for message in ws:
+                try:
+                    sequence = json.loads(message).get("ack")
+                except (ValueError, AttributeError):
+                    continue
+                now = time.monotonic()
+                if sequence in self._awaiting_ack:
+                    self.round_trip_times.add(now - self._awaiting_ack.pop(sequence), now)
+                    self.acked_commands += 1
+                elif sequence in self._expired_acks:
+                    self.round_trip_times.add(now - self._expired_acks.pop(sequence), now)
+                    self.late_commands += 1
+        except Exception:
+            # Connection errors are handled by the sender and the connection manager.
+            pass
+
+    def _expire_acks(self):
+        now = time.monotonic()
+        for sequence, send_time in list(self._awaiting_ack.items()):
+            if now - send_time > self.ack_timeout:
+                del self._awaiting_ack[sequence]
+                self._expired_acks[sequence] = send_time
+                self.lost_commands += 1
+        # Forget expired commands that never got an ack at all.
+        for sequence, send_time in list(self._expired_acks.items()):
+            if now - send_time > 10 * self.ack_timeout:
+                del self._expired_acks[sequence]
+
+    def command_stats(self):
+        """
+        Return counters of the command channel and, with acknowledged=True, the round-trip
+        time percentiles in milliseconds. Late commands are also counted as lost.
+        """
+        return {
+            "sent": self.sent_commands,
+            "suppressed": self.suppressed_commands,
+            "coalesced": self.coalesced_commands,
+            "acked": self.acked_commands,
+            "lost": self.lost_commands,
+            "late": self.late_commands,
+            "rtt_ms": self.round_trip_times.percentiles()
+        }
+
+    async def _shutdown(self):
+        self._closing = True
+        # Flush the newest command (e.g. the final stop) before closing.
+        pending = self._take_pending()
+        if pending is not None:
+            await self._send_command(*pending[:2])
+        self._disconnected.set()
+        self._command_event.set()
         if self.ws:
-            asyncio.run_coroutine_threadsafe(self.ws.close(), self.loop)
+            await self.ws.close()
+
+    def close(self):
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout=2.0)
+        except Exception as e:
+            print(f"Error while closing WebSocket: {e}")
         self.loop.call_soon_threadsafe(self.loop.stop)
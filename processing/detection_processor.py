@@ -10,6 +10,8 @@ class DetectionProcessor(ProcessingModule):
     def process(self, sensor_data: SensorData):
         if not self.detector:
             return sensor_data
-        sensor_data.left_detections = self.detector.detect(sensor_data.left_frame, 'left')
-        sensor_data.right_detections = self.detector.detect(sensor_data.right_frame, 'right')
+        # Run both cameras through the model as a single batch of two frames.
+        sensor_data.left_detections, sensor_data.right_detections = self.detector.detect_batch(
+            [sensor_data.left_frame, sensor_data.right_frame], ['left', 'right']
+        )
         return sensor_data
@@ -11,12 +11,14 @@ class DistanceEstimationProcessor(ProcessingModule):
     def process(self, sensor_data: SensorData):
         # Delegate processing to the DistanceEstimator for left detections.
         if sensor_data.left_detections:
-            sensor_data.left_detections = self.distance_estimator.process_detections(
-                sensor_data.left_detections
-            )
+            with self.profiler.span("distance", "left"):
+                sensor_data.left_detections = self.distance_estimator.process_detections(
+                    sensor_data.left_detections
+                )
         # Delegate processing for right detections.
         if sensor_data.right_detections:
-            sensor_data.right_detections = self.distance_estimator.process_detections(
-                sensor_data.right_detections
-            )
+            with self.profiler.span("distance", "right"):
+                sensor_data.right_detections = self.distance_estimator.process_detections(
+                    sensor_data.right_detections
+                )
         return sensor_data
@@ -0,0 +1,48 @@
+import threading
+from collections import deque
+
+class DropOldestQueue:
+    def __init__(self, maxsize):
+        """
+        Bounded queue that never blocks the producer: when full, the oldest item is dropped.
+        put(item, block=True) waits for space instead (backpressure, e.g. for benchmarks).
+
+        :param maxsize: Maximum number of queued items.
+        """
+        self.maxsize = maxsize
+        self._items = deque()
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item, block=False, timeout=None):
+        """
+        Append an item, dropping the oldest one if the queue is full.
+
+        :param block: Wait until there is space instead of dropping.
+        :param timeout: Maximum time to wait with block=True (None waits forever).
+        :return: False if block=True and no space became free within timeout, True otherwise.
+        """
+        with self._condition:
+            if block:
+                if not self._condition.wait_for(lambda: len(self._items) < self.maxsize, timeout=timeout):
+                    return False
+            elif len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            # Producers waiting for space and consumers share the condition.
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Remove and return the oldest item, or None if none arrived within timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._items, timeout=timeout):
+                return None
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def __len__(self):
+        with self._condition:
+            return len(self._items)
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from collections import deque
+import numpy as np
+
+class LatencyHistogram:
+    def __init__(self, window_size=1000):
+        """
+        Rolling window of latency samples (in seconds) with percentile and rate queries.
+
+        :param window_size: Number of most recent samples to keep.
+        """
+        self.samples = deque(maxlen=window_size)
+        self.completions = deque(maxlen=window_size)
+        self.count = 0
+
+    def add(self, duration, completed_at):
+        self.samples.append(duration)
+        self.completions.append(completed_at)
+        self.count += 1
+
+    def percentiles(self, percentiles=(50, 95, 99)):
+        """Return the requested percentiles in milliseconds (empty dict without samples)."""
+        if not self.samples:
+            return {}
+        values = np.percentile(np.fromiter(self.samples, dtype=np.float64), percentiles) * 1000.0
+        return {f"p{p}": float(v) for p, v in zip(percentiles, values)}
+
+    def fps(self):
+        """Completions per second over the sample window."""
+        if len(self.completions) < 2:
+            return 0.0
+        elapsed = self.completions[-1] - self.completions[0]
+        return (len(self.completions) - 1) / elapsed if elapsed > 0 else 0.0
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("profiler", "name", "camera", "start")
+
+    def __init__(self, profiler, name, camera):
+        self.profiler = profiler
+        self.name = name
+        self.camera = camera
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, self.start, time.perf_counter(), self.camera)
+        return False
+
+class PipelineProfiler:
+    def __init__(self, enabled=False, window_size=1000, trace_capacity=100000):
+        """
+        Collects timing spans of the processing pipeline into rolling latency histograms
+        and, optionally, Chrome trace events. When disabled, span() returns a shared no-op
+        context manager and record() returns immediately.
+
+        :param enabled: Whether timings are collected.
+        :param window_size: Number of samples per histogram used for percentiles and FPS.
+        :param trace_capacity: Maximum number of trace events kept for dump_chrome_trace (0 disables).
+        """
+        self.enabled = enabled
+        self.window_size = window_size
+        self.histograms = {}
+        self.trace_events = deque(maxlen=trace_capacity) if trace_capacity else None
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def span(self, name, camera=None):
+        """
+        Context manager timing a block, e.g. ``with profiler.span("tracking", "left"):``.
+
+        :param name: Span name, usually the module or stage name.
+        :param camera: Optional camera identifier, recorded as "name[camera]".
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, camera)
+
+    def record(self, name, start, end, camera=None):
+        """Record a span from perf_counter() start and end times."""
+        if not self.enabled:
+            return
+        key = f"{name}[{camera}]" if camera is not None else name
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram(self.window_size)
+            histogram.add(end - start, end)
+            if self.trace_events is not None:
+                self.trace_events.append((key, start, end, threading.get_ident()))
+
+    def record_latency(self, name, duration):
+        """Record a latency measured elsewhere (e.g. capture to hub), ending now."""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        self.record(name, end - duration, end)
+
+    def summary(self):
+        """Return {span: {"count", "fps", "p50", "p95", "p99"}} with latencies in milliseconds."""
+        with self._lock:
+            return {
+                key: {"count": histogram.count, "fps": histogram.fps(), **histogram.percentiles()}
+                for key, histogram in self.histograms.items()
+            }
+
+    def report(self):
+        """Print the summary as a table."""
+        for key, stats in sorted(self.summary().items()):
+            print(f"{key:<40} n={stats['count']:<7} fps={stats['fps']:6.1f} "
+                  f"p50={stats.get('p50', 0):7.2f}ms p95={stats.get('p95', 0):7.2f}ms "
+                  f"p99={stats.get('p99', 0):7.2f}ms", flush=True)
+
+    def dump_chrome_trace(self, path):
+        """Write the collected spans as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self.trace_events or [])
+        trace = [
+            {
+                "name": key,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": 0,
+                "tid": thread_id
+            }
+            for key, start, end, thread_id in events
+        ]
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+# Shared disabled profiler, the default for modules that were never given one.
+DISABLED_PROFILER = PipelineProfiler(enabled=False, trace_capacity=0)
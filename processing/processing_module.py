@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
 from robot_navigation.data.sensor_data import SensorData
+from robot_navigation.processing.pipeline_profiler import DISABLED_PROFILER
 
 class ProcessingModule(ABC):
+    # Set by ProcessingPipelineManager.register_module; modules may time sub-steps with
+    # ``with self.profiler.span(name, camera):``.
+    profiler = DISABLED_PROFILER
+
     @abstractmethod
     def process(self, sensor_data: SensorData):
         """Process sensor data and return updated data"""
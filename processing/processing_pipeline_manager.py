@@ -1,20 +1,159 @@
+import itertools
+import threading
+import time
 from robot_navigation.data.sensor_data import SensorData
 from robot_navigation.data.sensor_data_hub import SensorDataHub
+from robot_navigation.processing.drop_oldest_queue import DropOldestQueue
+from robot_navigation.processing.pipeline_profiler import PipelineProfiler
 
 class ProcessingPipelineManager:
-    def __init__(self, sensor_data_hub: SensorDataHub, processing_modules=None):
+    def __init__(self, sensor_data_hub: SensorDataHub, processing_modules=None, pipelined=False, queue_size=2,
+                 profiler=None, backpressure=False):
+        """
+        :param sensor_data_hub: Hub that receives the processed SensorData.
+        :param processing_modules: Optional initial list of processing modules.
+        :param pipelined: Run every stage on its own worker thread, connected by bounded queues,
+                          so consecutive frames overlap and throughput is limited by the slowest
+                          stage instead of the sum of all stages. Call start() before processing.
+        :param queue_size: Capacity of the queue in front of each stage; when a queue is full
+                           its oldest frame is dropped.
+        :param profiler: Optional PipelineProfiler; every module.process call and the
+                         capture-to-hub latency are recorded into it.
+        :param backpressure: Block on full queues instead of dropping frames, so process_and_update
+                             waits for the pipeline. Feeding it as fast as possible then measures the
+                             pipeline's capacity (used by the replay benchmark, not on the robot).
+        """
         self.sensor_data_hub = sensor_data_hub
         self.processing_modules = processing_modules or []
+        # Stage name per module; consecutive modules with the same name share a worker.
+        self.module_stages = [None] * len(self.processing_modules)
+        self.profiler = profiler or PipelineProfiler(enabled=False)
+        for module in self.processing_modules:
+            module.profiler = self.profiler
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.queues = []
+        self.workers = []
+        self.running = False
+        self._frame_counter = itertools.count()
+        self._publish_lock = threading.Lock()
+        self._last_published = -1
+
+    def register_module(self, module, stage=None):
+        """
+        Dynamically add a processing module.
 
-    def register_module(self, module):
-        """Dynamically add a processing module."""
+        :param module: The ProcessingModule to append.
+        :param stage: Optional stage name. In pipelined mode consecutive modules registered with
+                      the same stage name run together on one worker, every other module gets
+                      its own worker.
+        """
+        module.profiler = self.profiler
         self.processing_modules.append(module)
+        self.module_stages.append(stage)
 
-    def process_and_update(self, left_frame, right_frame):
-        sensor_data = SensorData(left_frame=left_frame, right_frame=right_frame)
+    def _build_stages(self):
+        stages = []
+        previous_stage = None
+        for module, stage in zip(self.processing_modules, self.module_stages):
+            if stages and stage is not None and stage == previous_stage:
+                stages[-1].append(module)
+            else:
+                stages.append([module])
+            previous_stage = stage
+        return stages
 
-        for module in self.processing_modules:
-            sensor_data = module.process(sensor_data)
+    def start(self):
+        """Start the stage workers (pipelined mode only)."""
+        if not self.pipelined or self.running:
+            return
+        self.running = True
+        stages = self._build_stages()
+        self.queues = [DropOldestQueue(self.queue_size) for _ in stages]
+        for index, modules in enumerate(stages):
+            output_queue = self.queues[index + 1] if index + 1 < len(stages) else None
+            worker = threading.Thread(
+                target=self._run_stage, args=(modules, self.queues[index], output_queue), daemon=True
+            )
+            worker.start()
+            self.workers.append(worker)
+
+    def stop(self):
+        """Stop the stage workers."""
+        self.running = False
+        for worker in self.workers:
+            worker.join(timeout=2.0)
+        self.workers = []
+
+    @property
+    def dropped_frames(self):
+        """Number of frames dropped by full stage queues in pipelined mode."""
+        return sum(queue.dropped for queue in self.queues)
+
+    def _run_stage(self, modules, input_queue, output_queue):
+        while self.running:
+            item = input_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            frame_index, sensor_data = item
+            try:
+                for module in modules:
+                    sensor_data = self._run_module(module, sensor_data)
+            except Exception as e:
+                print(f"Error in processing stage {type(modules[0]).__name__}: {e}")
+                continue
+            if output_queue is not None:
+                self._put(output_queue, (frame_index, sensor_data))
+            else:
+                self._publish(frame_index, sensor_data)
+
+    def _put(self, queue, item):
+        if not self.backpressure:
+            queue.put(item)
+            return
+        # Wake up now and then, so a stopped pipeline does not block forever.
+        while self.running and not queue.put(item, block=True, timeout=0.1):
+            pass
 
+    def _publish(self, frame_index, sensor_data):
+        # Only ever move forward, so the hub sees frames in capture order.
+        with self._publish_lock:
+            if frame_index <= self._last_published:
+                return
+            self._last_published = frame_index
+            self._update_hub(sensor_data)
+
+    def _run_module(self, module, sensor_data):
+        if not self.profiler.enabled:
+            return module.process(sensor_data)
+        with self.profiler.span(type(module).__name__):
+            return module.process(sensor_data)
+
+    def _update_hub(self, sensor_data):
         self.sensor_data_hub.update(sensor_data)
+        if self.profiler.enabled and sensor_data.capture_timestamp is not None:
+            self.profiler.record_latency("capture_to_hub", time.monotonic() - sensor_data.capture_timestamp)
+
+    def process_and_update(self, left_frame, right_frame, sequence=None, capture_timestamp=None):
+        """
+        Run a frame pair through all modules and update the SensorDataHub.
+        In pipelined mode the pair is only queued for the first stage and None is returned;
+        the hub is updated once the last stage has finished.
+        """
+        sensor_data = SensorData(
+            left_frame=left_frame,
+            right_frame=right_frame,
+            sequence=sequence,
+            capture_timestamp=capture_timestamp
+        )
+
+        if self.pipelined and self.running:
+            self._put(self.queues[0], (next(self._frame_counter), sensor_data))
+            return None
+
+        for module in self.processing_modules:
+            sensor_data = self._run_module(module, sensor_data)
+
+        self._update_hub(sensor_data)
         return sensor_data
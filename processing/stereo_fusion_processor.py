@@ -0,0 +1,19 @@
+from robot_navigation.processing.processing_module import ProcessingModule
+from robot_navigation.data.sensor_data import SensorData
+
+class StereoFusionProcessor(ProcessingModule):
+    def __init__(self, triangulator):
+        """
+        :param triangulator: An instance of StereoTriangulator.
+        """
+        self.triangulator = triangulator
+        if not self.triangulator:
+            print("[Warning] Stereo triangulator not available.")
+
+    def process(self, sensor_data: SensorData):
+        if not self.triangulator:
+            return sensor_data
+        sensor_data.obstacles = self.triangulator.fuse(
+            sensor_data.left_detections, sensor_data.right_detections
+        )
+        return sensor_data
@@ -10,9 +10,11 @@ class TrackingProcessor(ProcessingModule):
     def process(self, sensor_data: SensorData):
         if not self.tracker:
             return sensor_data
-        if not sensor_data.left_detections or not sensor_data.right_detections:
-            print("[Warning] Tracking module requires detections but none were found.", flush=True)
-            return sensor_data
-        sensor_data.left_tracking = self.tracker.update(sensor_data.left_detections, 'left')
-        sensor_data.right_tracking = self.tracker.update(sensor_data.right_detections, 'right')
+        # Update even without detections, so tracks keep being predicted and missed ones expire.
+        with self.profiler.span("tracking", "left"):
+            sensor_data.left_detections = self.tracker.update(sensor_data.left_detections, 'left')
+        with self.profiler.span("tracking", "right"):
+            sensor_data.right_detections = self.tracker.update(sensor_data.right_detections, 'right')
+        sensor_data.left_tracking = self.tracker.get_tracks('left')
+        sensor_data.right_tracking = self.tracker.get_tracks('right')
         return sensor_data
@@ -3,10 +3,19 @@ from robot_navigation.data.sensor_data import SensorData
 from robot_navigation.visualizing.frame_visualizer import FrameVisualizer
 
 class VisualizingProcessor(ProcessingModule):
-    def __init__(self, visualizer: FrameVisualizer):
+    def __init__(self, visualizer: FrameVisualizer, lazy=True):
+        """
+        :param visualizer: The FrameVisualizer used to annotate the frames.
+        :param lazy: Only attach the visualizer, so frames are copied and drawn on demand when a
+                     consumer reads left/right_frame_visualized. Otherwise draw both frames now.
+        """
         self.visualizer = visualizer
+        self.lazy = lazy
 
     def process(self, sensor_data: SensorData):
+        sensor_data.visualizer = self.visualizer
+        if self.lazy:
+            return sensor_data
         sensor_data.left_frame_visualized = self.visualizer.draw_enriched_frame(
             sensor_data.left_frame.copy(), sensor_data.left_detections, sensor_data.left_tracking
         )
@@ -1,27 +1,67 @@
+import time
 import cv2
 import numpy as np
 
 class DualCameraRenderer:
-    def __init__(self, window_name="Robot Navigation"):
+    def __init__(self, window_name="Robot Navigation", max_fps=30.0):
+        """
+        Shows the camera frames side by side in one window.
+        The frames are written straight into a persistent canvas, which is only reallocated
+        when the frame sizes change, and the display is refreshed at most max_fps times per second.
+
+        :param window_name: Name of the OpenCV window.
+        :param max_fps: Display refresh rate cap (None or 0 disables the cap).
+        """
         self.window_name = window_name
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.canvas = None
+        self.last_draw_time = None
+        self.drawn_frames = 0
+
+    def due(self):
+        """Whether the refresh rate cap allows drawing now."""
+        return self.last_draw_time is None or time.monotonic() - self.last_draw_time >= self.min_interval
+
+    def wait_ms(self):
+        """Milliseconds until the next refresh is allowed, at least 1 (for cv2.waitKey)."""
+        if self.last_draw_time is None:
+            return 1
+        remaining = self.min_interval - (time.monotonic() - self.last_draw_time)
+        return max(1, int(remaining * 1000))
+
+    def _ensure_canvas(self, frames):
+        height = max(frame.shape[0] for frame in frames)
+        width = sum(frame.shape[1] for frame in frames)
+        shape = (height, width) + frames[0].shape[2:]
+        if self.canvas is None or self.canvas.shape != shape or self.canvas.dtype != frames[0].dtype:
+            self.canvas = np.zeros(shape, dtype=frames[0].dtype)
+        return self.canvas
 
     def show(self, frames):
         """
         Combines the frames from multiple cameras and displays them.
 
         :param frames: Dictionary of frames, keyed by camera index.
+        :return: True if the window was redrawn, False if there was nothing to draw or the
+                 refresh rate cap did not allow it yet.
         """
-        processed_frames = []
-        for i in sorted(frames.keys()):
-            if frames[i] is None:
-                continue
-            frame_copy = frames[i].copy()
-            processed_frames.append(frame_copy)
-        if not processed_frames:
-            return
-
-        combined_frame = np.hstack(tuple(processed_frames))
-        # Print only the shape of the combined frame to avoid flooding the console.
-        #print("[DEBUG] got frames, combined shape:", combined_frame.shape, flush=True)
-
-        cv2.imshow(self.window_name, combined_frame)
+        if not self.due():
+            return False
+        ordered_frames = [frames[i] for i in sorted(frames.keys()) if frames[i] is not None]
+        if not ordered_frames:
+            return False
+        if any(frame.shape[2:] != ordered_frames[0].shape[2:] for frame in ordered_frames):
+            print("[Warning] Cannot combine frames with different channel counts.")
+            return False
+
+        canvas = self._ensure_canvas(ordered_frames)
+        x = 0
+        for frame in ordered_frames:
+            height, width = frame.shape[:2]
+            canvas[:height, x:x + width] = frame
+            x += width
+
+        cv2.imshow(self.window_name, canvas)
+        self.last_draw_time = time.monotonic()
+        self.drawn_frames += 1
+        return True
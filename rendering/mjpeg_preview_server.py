@@ -0,0 +1,291 @@
+import hmac
+import ipaddress
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import cv2
+import numpy as np
+
+BOUNDARY = "frame"
+# Header that commands must carry. Browsers only send custom headers cross-origin after a CORS
+# preflight, which the server never grants, so other web pages cannot trigger commands.
+TOKEN_HEADER = "X-Preview-Token"
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Robot Navigation</title></head>
+<body style="background:#222;color:#ddd;font-family:sans-serif">
+<img src="/stream.mjpg" style="max-width:100%">
+<p>
+<button onclick="command('autonomy')">Toggle autonomy</button>
+<button onclick="command('enriched')">Toggle enriched view</button>
+</p>
+<script>
+const token = new URLSearchParams(location.search).get('token') || '';
+function command(name) {
+  fetch('/command/' + name, {method: 'POST', headers: {'X-Preview-Token': token}});
+}
+</script>
+</body>
+</html>
+"""
+
+class MjpegPreviewServer:
+    def __init__(self, sensor_data_hub, host="127.0.0.1", port=8080, max_fps=10.0, scale=0.5, jpeg_quality=70,
+                 token=None):
+        """
+        Serves a side-by-side preview of the latest SensorData as an MJPEG stream, plus a small
+        HTTP API for the controls that the OpenCV window offers as keys.
+
+        - GET /             : page with the stream and control buttons
+        - GET /stream.mjpg  : multipart/x-mixed-replace JPEG stream
+        - GET /status       : JSON with the preview settings and the command states
+        - POST /command/<n> : run a registered command (see add_command), returns the status
+
+        JPEG encoding runs on one worker thread for all clients, at a reduced resolution and at
+        most max_fps. Without a connected client the worker does not encode anything.
+
+        Commands need the X-Preview-Token header, and a browser Origin must match the server.
+        On a non-loopback host they also need the token, which is generated when none is given
+        and printed as part of the page URL (http://host:port/?token=...).
+
+        :param sensor_data_hub: SensorDataHub to take the frames from.
+        :param host: Interface to listen on.
+        :param port: Port to listen on.
+        :param max_fps: Maximum preview frame rate.
+        :param scale: Preview size relative to the camera frames.
+        :param jpeg_quality: JPEG quality (0-100).
+        :param token: Token that commands must send in the X-Preview-Token header.
+        """
+        self.sensor_data_hub = sensor_data_hub
+        self.host = host
+        self.port = port
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.scale = scale
+        self.jpeg_quality = jpeg_quality
+        if token is None and not self.is_loopback(host):
+            token = secrets.token_urlsafe(16)
+        self.token = token
+        self.render_enriched = False
+        self.commands = {}
+        self.status_providers = {}
+        self.encoded_frames = 0
+
+        self._condition = threading.Condition()
+        self._clients = 0
+        self._jpeg = None
+        self._jpeg_id = 0
+        self._running = False
+        self._canvas = None
+        self._encoder_thread = None
+        self._server = None
+        self._server_thread = None
+
+        self.add_command("enriched", self.toggle_enriched, lambda: self.render_enriched)
+
+    def add_command(self, name, callback, status=None):
+        """
+        Register a command for POST /command/<name>.
+
+        :param callback: Called without arguments from the HTTP thread.
+        :param status: Optional callable returning the state shown for the command in /status.
+        """
+        self.commands[name] = callback
+        if status is not None:
+            self.status_providers[name] = status
+
+    @staticmethod
+    def is_loopback(host):
+        if host == "localhost":
+            return True
+        try:
+            return ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            return False
+
+    def command_error(self, headers):
+        """
+        Check the headers of a command request.
+
+        :return: None if the command may run, otherwise the reason to reject it.
+        """
+        token = headers.get(TOKEN_HEADER)
+        if token is None:
+            return f"missing {TOKEN_HEADER} header"
+        if self.token is not None and not hmac.compare_digest(token.encode(), self.token.encode()):
+            return "invalid token"
+        host = headers.get("Host", "")
+        origin = headers.get("Origin")
+        if origin is not None and urlsplit(origin).netloc != host:
+            return "cross-origin request"
+        if self.token is None and not self.is_loopback(urlsplit(f"//{host}").hostname or ""):
+            # A loopback server reached under another name, e.g. through DNS rebinding.
+            return "unexpected host"
+        return None
+
+    def toggle_enriched(self):
+        self.render_enriched = not self.render_enriched
+        print("Display mode:", "ENRICHED" if self.render_enriched else "RAW")
+
+    def status(self):
+        status = {name: provider() for name, provider in self.status_providers.items()}
+        status.update({"clients": self._clients, "encoded_frames": self.encoded_frames})
+        return status
+
+    @property
+    def clients(self):
+        return self._clients
+
+    def start(self):
+        self._running = True
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+        self._encoder_thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._encoder_thread.start()
+        query = f"?token={self.token}" if self.token is not None else ""
+        print(f"Preview server running on http://{self.host}:{self.port}/{query}")
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._encoder_thread is not None:
+            self._encoder_thread.join(timeout=2.0)
+
+    def _compose(self, sensor_data):
+        if self.render_enriched:
+            left_frame = sensor_data.left_frame_visualized
+            right_frame = sensor_data.right_frame_visualized
+            frames = [left_frame if left_frame is not None else sensor_data.left_frame,
+                      right_frame if right_frame is not None else sensor_data.right_frame]
+        else:
+            frames = [sensor_data.left_frame, sensor_data.right_frame]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return None
+
+        sizes = [(max(1, int(frame.shape[1] * self.scale)), max(1, int(frame.shape[0] * self.scale)))
+                 for frame in frames]
+        shape = (max(height for _, height in sizes), sum(width for width, _ in sizes)) + frames[0].shape[2:]
+        if self._canvas is None or self._canvas.shape != shape or self._canvas.dtype != frames[0].dtype:
+            self._canvas = np.zeros(shape, dtype=frames[0].dtype)
+        x = 0
+        for frame, (width, height) in zip(frames, sizes):
+            # Resize straight into the canvas, no intermediate image.
+            cv2.resize(frame, (width, height), dst=self._canvas[:height, x:x + width], interpolation=cv2.INTER_AREA)
+            x += width
+        return self._canvas
+
+    def _encode_loop(self):
+        version = 0
+        last_encode = 0.0
+        while True:
+            with self._condition:
+                # Nothing is encoded while no client is watching.
+                self._condition.wait_for(lambda: self._clients > 0 or not self._running)
+                if not self._running:
+                    return
+            wait = self.min_interval - (time.monotonic() - last_encode)
+            if wait > 0:
+                time.sleep(wait)
+            version, sensor_data = self.sensor_data_hub.wait_for_update(after_version=version, timeout=0.5)
+            if sensor_data is None:
+                continue
+            try:
+                canvas = self._compose(sensor_data)
+                if canvas is None:
+                    continue
+                ok, jpeg = cv2.imencode(".jpg", canvas, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            except Exception as e:
+                print(f"Error encoding preview frame: {e}")
+                continue
+            last_encode = time.monotonic()
+            if not ok:
+                continue
+            with self._condition:
+                self._jpeg = jpeg.tobytes()
+                self._jpeg_id += 1
+                self.encoded_frames += 1
+                self._condition.notify_all()
+
+    def _next_jpeg(self, after_id, timeout=1.0):
+        with self._condition:
+            self._condition.wait_for(lambda: self._jpeg_id > after_id or not self._running, timeout=timeout)
+            return self._jpeg_id, self._jpeg
+
+    def _stream(self, handler):
+        with self._condition:
+            self._clients += 1
+            self._condition.notify_all()
+        try:
+            handler.send_response(200)
+            handler.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+            handler.send_header("Cache-Control", "no-cache")
+            handler.end_headers()
+            jpeg_id = 0
+            while self._running:
+                new_id, jpeg = self._next_jpeg(jpeg_id)
+                if new_id == jpeg_id or jpeg is None:
+                    continue
+                jpeg_id = new_id
+                handler.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                handler.wfile.write(jpeg)
+                handler.wfile.write(b"\r\n")
+                handler.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._condition:
+                self._clients -= 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, status, data):
+                self._send(status, json.dumps(data).encode(), "application/json")
+
+            def do_GET(self):
+                if urlsplit(self.path).path == "/":
+                    self._send(200, INDEX_PAGE.encode(), "text/html")
+                elif self.path == "/stream.mjpg":
+                    server._stream(self)
+                elif self.path == "/status":
+                    self._send_json(200, server.status())
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                name = self.path[len("/command/"):] if self.path.startswith("/command/") else None
+                if name not in server.commands:
+                    self._send_json(404, {"error": "unknown command"})
+                    return
+                error = server.command_error(self.headers)
+                if error is not None:
+                    self._send_json(403, {"error": error})
+                    return
+                server.commands[name]()
+                self._send_json(200, server.status())
+
+            def log_message(self, format, *args):
+                # Keep the console for the processing reports.
+                pass
+
+        return Handler
@@ -2,21 +2,34 @@ class SensorDataRenderer:
     def __init__(self, renderer):
         self.renderer = renderer
         self.render_enriched = False
+        # What was drawn last, so unchanged sensor data is not drawn again.
+        self._last_sensor_data = None
+        self._last_enriched = None
+
+    def is_new(self, sensor_data):
+        """Whether sensor_data (in the current display mode) differs from what was drawn last."""
+        return sensor_data is not self._last_sensor_data or self.render_enriched != self._last_enriched
 
     def show(self, sensor_data):
         """
         Gets the frames from SensorData object and passes them to the renderer.
+        Nothing is drawn if the same SensorData was already drawn in the same mode.
 
         :param sensor_data: SensorData object
+        :return: True if the frames were drawn.
         """
         if sensor_data is None:
             #print("[DEBUG] sensor data is NONE", flush=True)
-            return
+            return False
+        if not self.is_new(sensor_data) or not self.renderer.due():
+            return False
 
         if self.render_enriched:
+            left_frame = sensor_data.left_frame_visualized
+            right_frame = sensor_data.right_frame_visualized
             frames = {
-                0: sensor_data.left_frame_visualized if sensor_data.left_frame_visualized is not None else sensor_data.left_frame,
-                1: sensor_data.right_frame_visualized if sensor_data.right_frame_visualized is not None else sensor_data.right_frame,
+                0: left_frame if left_frame is not None else sensor_data.left_frame,
+                1: right_frame if right_frame is not None else sensor_data.right_frame,
             }
         else:
             frames = {
@@ -24,4 +37,8 @@ class SensorDataRenderer:
                 1: sensor_data.right_frame,
             }
 
-        self.renderer.show(frames)
+        drawn = self.renderer.show(frames)
+        if drawn:
+            self._last_sensor_data = sensor_data
+            self._last_enriched = self.render_enriched
+        return drawn
@@ -0,0 +1,62 @@
+import time
+import unittest
+from robot_navigation.data.sensor_data import SensorData
+from robot_navigation.data.sensor_data_hub import SensorDataHub
+from robot_navigation.navigation.autonomous_navigator import AutonomousNavigator
+from robot_navigation.network.websocket_client import STOP_COMMAND
+
+DRIVE_COMMAND = (1.0, 1.0)
+
+class RecordingClient:
+    """Stand-in for WebSocketClient that records the commands."""
+    def __init__(self):
+        self.commands = []
+
+    def send_command(self, left, right):
+        self.commands.append((left, right))
+
+class DriveStrategy:
+    def decide(self, sensor_data):
+        return DRIVE_COMMAND
+
+class AutonomousNavigatorStaleDataTest(unittest.TestCase):
+    def start_navigator(self, **options):
+        self.hub = SensorDataHub()
+        self.client = RecordingClient()
+        navigator = AutonomousNavigator(
+            self.hub, self.client, DriveStrategy(), decision_interval=0.05, max_command_period=0.05,
+            max_data_age=0.2, **options
+        )
+        navigator.enabled = True
+        self.addCleanup(navigator.stop)
+        return navigator
+
+    def assert_stops_after_stall(self):
+        self.hub.update(SensorData(sequence=0, capture_timestamp=time.monotonic()))
+        # Perception stalls: no further SensorData.
+        time.sleep(0.6)
+        commands = list(self.client.commands)
+        self.assertIn(DRIVE_COMMAND, commands)
+        self.assertEqual(commands[-1], STOP_COMMAND)
+        self.assertEqual(commands.count(STOP_COMMAND), 1)
+        # Nothing but the single stop after the drive commands.
+        self.assertEqual(commands, [DRIVE_COMMAND] * (len(commands) - 1) + [STOP_COMMAND])
+        # Drive commands are repeated only while the data is at most max_data_age old.
+        self.assertLessEqual(commands.count(DRIVE_COMMAND), 0.2 / 0.05 + 1)
+
+    def test_event_driven_keepalive_stops_on_stale_data(self):
+        self.start_navigator(event_driven=True)
+        self.assert_stops_after_stall()
+
+    def test_polling_stops_on_stale_data(self):
+        self.start_navigator(event_driven=False)
+        self.assert_stops_after_stall()
+
+    def test_stale_data_is_not_acted_on(self):
+        self.start_navigator(event_driven=True)
+        self.hub.update(SensorData(sequence=0, capture_timestamp=time.monotonic() - 1.0))
+        time.sleep(0.2)
+        self.assertEqual(self.client.commands, [])
+
+if __name__ == '__main__':
+    unittest.main()
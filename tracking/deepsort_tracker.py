@@ -1,7 +1,16 @@
+import numpy as np
+from robot_navigation.data.detections import Detections, labels_for_class_ids
+from robot_navigation.tracking.iou_assignment import assign_by_iou
+from robot_navigation.tracking.kalman_filter_bank import KalmanFilterBank
+
 class DeepSortTracker:
     def __init__(self, iou_threshold=0.3, max_missed=3):
         """
         A simple DeepSORT-like tracker that uses IoU for detection-to-track association.
+        Detections and tracks of the same label are matched globally (Hungarian algorithm on
+        the IoU matrix), so the result does not depend on the order of the detections.
+        Every track is a constant-velocity Kalman filter, all filters of a camera are kept
+        in one KalmanFilterBank and predicted/updated together.
         
         :param iou_threshold: Minimum IoU to consider a detection matching an existing track.
         :param max_missed: Maximum number of consecutive frames a track can be missed before removal.
@@ -9,8 +18,10 @@ class DeepSortTracker:
         self.iou_threshold = iou_threshold
         self.max_missed = max_missed
         self.next_track_id = 0
-        # Dictionary mapping camera_id to a list of active tracks.
+        # Dictionary mapping camera_id to the KalmanFilterBank of its active tracks.
         self.tracks = {}
+        # Integer codes for labels, in insertion order.
+        self.label_codes = {}
 
     def compute_iou(self, bbox1, bbox2):
         """
@@ -37,63 +48,103 @@ class DeepSortTracker:
     def update(self, detections, camera_id):
         """
         Update tracks for a given camera using the current detections.
-        This method assigns a 'track_id' to each detection.
+        All tracks are first predicted one frame ahead by the Kalman filter bank, detections are
+        then associated with the predicted boxes. This method assigns a 'track_id' to each detection.
         
-        :param detections: List of detection dictionaries, each containing:
+        :param detections: Detections, or a list of detection dictionaries, each containing:
                            - 'bbox': [x1, y1, x2, y2]
                            - 'label': a string label.
                            Other keys (like 'confidence', 'distance', etc.) remain intact.
         :param camera_id: Identifier for the camera (e.g., 'left' or 'right').
-        :return: The list of detections with a new 'track_id' key added.
+        :return: The detections with their track_id set (a new 'track_id' key for dictionaries).
         """
-        # Initialize track list for this camera if not present.
+        # Initialize the filter bank for this camera if not present.
         if camera_id not in self.tracks:
-            self.tracks[camera_id] = []
-        active_tracks = self.tracks[camera_id]
-        # Create a helper list to mark which tracks have been updated.
-        assigned = [False] * len(active_tracks)
+            self.tracks[camera_id] = KalmanFilterBank()
+        bank = self.tracks[camera_id]
+        bank.predict()
+        predicted_boxes = bank.boxes()
+
+        if isinstance(detections, Detections):
+            detection_boxes = detections.bbox
+            # Look up the code once per distinct class id.
+            class_ids, inverse = np.unique(detections.class_id, return_inverse=True)
+            detection_labels = self._label_codes(labels_for_class_ids(class_ids).tolist())
+            detection_labels = detection_labels[inverse.reshape(-1)]
+        else:
+            detection_boxes = np.array(
+                [detection["bbox"] for detection in detections], dtype=np.float64
+            ).reshape(-1, 4)
+            detection_labels = self._label_codes([detection.get("label") for detection in detections])
+        # Row of the matched track per detection (-1 if unmatched).
+        matched_tracks = np.full(len(detections), -1, dtype=np.int64)
+
+        # Associate detections and predicted tracks label by label.
+        for label in np.unique(detection_labels):
+            detection_indices = np.flatnonzero(detection_labels == label)
+            track_indices = np.flatnonzero(bank.labels == label)
+            if len(track_indices) == 0:
+                continue
+            matched_detections, matched_track_rows = assign_by_iou(
+                detection_boxes[detection_indices], predicted_boxes[track_indices], self.iou_threshold
+            )
+            matched_tracks[detection_indices[matched_detections]] = track_indices[matched_track_rows]
+
+        matched = matched_tracks >= 0
+        # Correct the matched tracks, age all others.
+        bank.update(matched_tracks[matched], detection_boxes[matched])
+        bank.missed += 1
+        bank.missed[matched_tracks[matched]] = 0
 
-        # Process each detection.
-        for detection in detections:
-            best_iou = 0.0
-            best_idx = -1
-            # Try to find the best matching track based on IoU and same label.
-            for i, track in enumerate(active_tracks):
-                if detection.get("label") != track.get("label"):
-                    continue
-                iou = self.compute_iou(detection["bbox"], track["bbox"])
-                if iou > best_iou and not assigned[i]:
-                    best_iou = iou
-                    best_idx = i
-            if best_idx != -1 and best_iou >= self.iou_threshold:
-                # A matching track was found: update the track.
-                track = active_tracks[best_idx]
-                detection["track_id"] = track["track_id"]
-                track["bbox"] = detection["bbox"]
-                track["missed"] = 0  # Reset missed count.
-                assigned[best_idx] = True
-            else:
-                # No suitable track was found: create a new track.
-                detection["track_id"] = self.next_track_id
-                new_track = {
-                    "track_id": self.next_track_id,
-                    "bbox": detection["bbox"],
-                    "label": detection["label"],
-                    "missed": 0
-                }
-                active_tracks.append(new_track)
-                assigned.append(True)
-                self.next_track_id += 1
+        # No suitable track was found for the remaining detections: create new tracks.
+        new_track_ids = np.arange(self.next_track_id, self.next_track_id + int((~matched).sum()))
+        self.next_track_id += len(new_track_ids)
+        track_ids = np.empty(len(detections), dtype=np.int64)
+        track_ids[matched] = bank.track_ids[matched_tracks[matched]]
+        track_ids[~matched] = new_track_ids
+        if isinstance(detections, Detections):
+            detections.track_id = track_ids
+        else:
+            for detection, track_id in zip(detections, track_ids.tolist()):
+                detection["track_id"] = track_id
 
-        # Increase missed count for tracks not updated in this frame.
-        new_active_tracks = []
-        for i, track in enumerate(active_tracks):
-            if assigned[i]:
-                new_active_tracks.append(track)
-            else:
-                track["missed"] += 1
-                if track["missed"] <= self.max_missed:
-                    new_active_tracks.append(track)
-        self.tracks[camera_id] = new_active_tracks
+        # Drop tracks that were missed too often, then add the new ones.
+        bank.remove(bank.missed > self.max_missed)
+        bank.initiate(detection_boxes[~matched], new_track_ids, detection_labels[~matched])
 
         return detections
+
+    def _label_codes(self, labels):
+        """Map labels to their integer codes, assigning new codes to unseen labels."""
+        return np.array(
+            [self.label_codes.setdefault(label, len(self.label_codes)) for label in labels], dtype=np.int64
+        )
+
+    def get_tracks(self, camera_id):
+        """
+        Return the active tracks of a camera as a list of dictionaries with the keys
+        'track_id', 'label', 'bbox', 'position' (box center in pixels), 'velocity'
+        (pixels per frame) and 'missed' (frames since the last matched detection).
+        """
+        bank = self.tracks.get(camera_id)
+        if bank is None or len(bank) == 0:
+            return []
+        labels = list(self.label_codes)
+        return [
+            {
+                "track_id": track_id,
+                "label": labels[label],
+                "bbox": bbox,
+                "position": position,
+                "velocity": velocity,
+                "missed": missed
+            }
+            for track_id, label, bbox, position, velocity, missed in zip(
+                bank.track_ids.tolist(),
+                bank.labels.tolist(),
+                bank.boxes().tolist(),
+                bank.positions().tolist(),
+                bank.velocities().tolist(),
+                bank.missed.tolist()
+            )
+        ]
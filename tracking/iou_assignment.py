@@ -0,0 +1,28 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from robot_navigation.detection.iou import pairwise_iou
+
+def assign_by_iou(detection_boxes, track_boxes, iou_threshold):
+    """
+    Globally associate detections with tracks by maximizing the total IoU.
+    The IoU cost matrix is computed in one vectorized pass and solved with the
+    Hungarian algorithm, pairs below iou_threshold (or without any overlap) are gated out.
+
+    :param detection_boxes: Array-like of shape (N, 4) with [x1, y1, x2, y2] boxes.
+    :param track_boxes: Array-like of shape (M, 4) with [x1, y1, x2, y2] boxes.
+    :param iou_threshold: Minimum IoU for a detection/track pair to be matched.
+    :return: Tuple (detection_indices, track_indices) of matched pairs as integer arrays.
+    """
+    detection_boxes = np.asarray(detection_boxes, dtype=np.float64).reshape(-1, 4)
+    track_boxes = np.asarray(track_boxes, dtype=np.float64).reshape(-1, 4)
+    if len(detection_boxes) == 0 or len(track_boxes) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    iou = pairwise_iou(detection_boxes[:, None, :], track_boxes[None, :, :])
+    # Gated pairs get zero gain, so they never displace a valid match.
+    allowed = (iou >= iou_threshold) & (iou > 0)
+    gain = np.where(allowed, iou, 0.0)
+    detection_indices, track_indices = linear_sum_assignment(gain, maximize=True)
+    valid = allowed[detection_indices, track_indices]
+    return detection_indices[valid], track_indices[valid]
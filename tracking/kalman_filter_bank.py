@@ -0,0 +1,142 @@
+import numpy as np
+
+def xyxy_to_cxcywh(boxes):
+    """Convert (N, 4) [x1, y1, x2, y2] boxes to [center_x, center_y, width, height]."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    return np.stack([
+        (boxes[:, 0] + boxes[:, 2]) / 2,
+        (boxes[:, 1] + boxes[:, 3]) / 2,
+        boxes[:, 2] - boxes[:, 0],
+        boxes[:, 3] - boxes[:, 1]
+    ], axis=1)
+
+def cxcywh_to_xyxy(boxes):
+    """Convert (N, 4) [center_x, center_y, width, height] boxes to [x1, y1, x2, y2]."""
+    half_width = boxes[:, 2] / 2
+    half_height = boxes[:, 3] / 2
+    return np.stack([
+        boxes[:, 0] - half_width,
+        boxes[:, 1] - half_height,
+        boxes[:, 0] + half_width,
+        boxes[:, 1] + half_height
+    ], axis=1)
+
+class KalmanFilterBank:
+    def __init__(self, std_weight_position=1.0 / 20, std_weight_velocity=1.0 / 160):
+        """
+        Constant-velocity Kalman filters for all tracks of one camera, stored as stacked arrays.
+        The state of a track is [cx, cy, w, h, vx, vy, vw, vh] in pixels and pixels per frame.
+        Predict and update run for all tracks at once; there is no Python object per track.
+        Like DeepSORT, the noise standard deviations are scaled by the box height.
+
+        :param std_weight_position: Position noise relative to the box height.
+        :param std_weight_velocity: Velocity noise relative to the box height.
+        """
+        self.std_weight_position = std_weight_position
+        self.std_weight_velocity = std_weight_velocity
+
+        # Transition (x += v per frame) and observation (measure cx, cy, w, h) matrices.
+        self.transition = np.eye(8)
+        self.transition[:4, 4:] = np.eye(4)
+        self.observation = np.eye(4, 8)
+
+        self.mean = np.zeros((0, 8))
+        self.covariance = np.zeros((0, 8, 8))
+        self.track_ids = np.zeros(0, dtype=np.int64)
+        self.labels = np.zeros(0, dtype=np.int64)
+        self.missed = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.mean)
+
+    def _position_std(self, heights):
+        return self.std_weight_position * np.abs(heights)
+
+    def _velocity_std(self, heights):
+        return self.std_weight_velocity * np.abs(heights)
+
+    def initiate(self, boxes, track_ids, labels):
+        """
+        Start new tracks from unmatched detections, with zero initial velocity.
+
+        :param boxes: Array of shape (N, 4) with [x1, y1, x2, y2] boxes.
+        :param track_ids: Integer array of shape (N,) with the new track IDs.
+        :param labels: Integer array of shape (N,) with label codes.
+        """
+        measurements = xyxy_to_cxcywh(boxes)
+        count = len(measurements)
+        if count == 0:
+            return
+        mean = np.concatenate([measurements, np.zeros((count, 4))], axis=1)
+        heights = measurements[:, 3:4]
+        std = np.concatenate([
+            2 * self._position_std(heights).repeat(4, axis=1),
+            10 * self._velocity_std(heights).repeat(4, axis=1)
+        ], axis=1)
+        covariance = np.zeros((count, 8, 8))
+        covariance[:, np.arange(8), np.arange(8)] = np.square(std)
+
+        self.mean = np.concatenate([self.mean, mean])
+        self.covariance = np.concatenate([self.covariance, covariance])
+        self.track_ids = np.concatenate([self.track_ids, np.asarray(track_ids, dtype=np.int64)])
+        self.labels = np.concatenate([self.labels, np.asarray(labels, dtype=np.int64)])
+        self.missed = np.concatenate([self.missed, np.zeros(count, dtype=np.int64)])
+
+    def predict(self):
+        """Advance all tracks by one frame."""
+        if len(self) == 0:
+            return
+        heights = self.mean[:, 3:4]
+        std = np.concatenate([
+            self._position_std(heights).repeat(4, axis=1),
+            self._velocity_std(heights).repeat(4, axis=1)
+        ], axis=1)
+        self.mean = self.mean @ self.transition.T
+        self.covariance = self.transition @ self.covariance @ self.transition.T
+        self.covariance[:, np.arange(8), np.arange(8)] += np.square(std)
+
+    def update(self, indices, boxes):
+        """
+        Correct the selected tracks with their matched measurements in one batched step.
+
+        :param indices: Integer array of shape (K,) with the track rows to update.
+        :param boxes: Array of shape (K, 4) with the matched [x1, y1, x2, y2] boxes.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return
+        measurements = xyxy_to_cxcywh(boxes)
+        mean = self.mean[indices]
+        covariance = self.covariance[indices]
+
+        measurement_std = self._position_std(mean[:, 3:4]).repeat(4, axis=1)
+        projected_mean = mean @ self.observation.T
+        projected_covariance = self.observation @ covariance @ self.observation.T
+        projected_covariance[:, np.arange(4), np.arange(4)] += np.square(measurement_std)
+
+        # Kalman gain K = P H^T S^-1, solved as S K^T = H P (S and P are symmetric).
+        gain = np.linalg.solve(projected_covariance, self.observation @ covariance).transpose(0, 2, 1)
+        innovation = measurements - projected_mean
+        self.mean[indices] = mean + np.einsum('nij,nj->ni', gain, innovation)
+        self.covariance[indices] = covariance - gain @ projected_covariance @ gain.transpose(0, 2, 1)
+
+    def remove(self, mask):
+        """Drop all tracks where mask is True."""
+        keep = ~np.asarray(mask, dtype=bool)
+        self.mean = self.mean[keep]
+        self.covariance = self.covariance[keep]
+        self.track_ids = self.track_ids[keep]
+        self.labels = self.labels[keep]
+        self.missed = self.missed[keep]
+
+    def boxes(self):
+        """Return the current track boxes as (N, 4) [x1, y1, x2, y2]."""
+        return cxcywh_to_xyxy(self.mean[:, :4])
+
+    def positions(self):
+        """Return the current box centers as (N, 2)."""
+        return self.mean[:, :2]
+
+    def velocities(self):
+        """Return the current center velocities in pixels per frame as (N, 2)."""
+        return self.mean[:, 4:6]
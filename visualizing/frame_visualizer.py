@@ -14,8 +14,8 @@ class FrameVisualizer:
         Draw bounding boxes, labels, distance info, and tracking IDs on the frame.
         
         :param frame: The image frame as a NumPy array.
-        :param detections: List of detection dictionaries, where each dictionary should
-                           have at least the keys "bbox", "label", "confidence", "camera_height",
+        :param detections: Detections, or a list of detection dictionaries, where each dictionary
+                           should have at least the keys "bbox", "label", "confidence", "camera_height",
                            and optionally "distance" and "track_id".
         :param tracking_objects: (Optional) List of tracking dictionaries with keys "track_id",
                                  "position", "velocity", etc.